@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from typing import Dict, Iterator, List, Tuple
 
@@ -51,18 +52,98 @@ RAW_ADJACENCY: Dict[int, List[Tuple[int, int | None]]] = {
 }
 
 
-# Collect edges for a node
-def neighbors(node: int) -> List[Edge]:
+# The graph is static, so build the Edge objects once
+_EDGES: Dict[int, Tuple[Edge, ...]] = {
+    node: tuple(Edge(neighbor=nb, landing=landing) for nb, landing in edges)
+    for node, edges in RAW_ADJACENCY.items()
+}
+
+
+# Collect edges for a node (shared, read-only tuple)
+def neighbors(node: int) -> Tuple[Edge, ...]:
     try:
-        return [Edge(neighbor=nb, landing=landing) for nb, landing in RAW_ADJACENCY[node]]
+        return _EDGES[node]
     except KeyError as exc:
         raise ValueError(f"Unknown node index: {node}") from exc
 
 
 # Iterate across every edge
 def all_edges() -> Iterator[tuple[int, Edge]]:
-    for node, edges in RAW_ADJACENCY.items():
-        for nb, landing in edges:
-            yield node, Edge(neighbor=nb, landing=landing)
+    for node, edges in _EDGES.items():
+        for edge in edges:
+            yield node, edge
+
+
+# Bitboard views of the graph, bit i standing for node i
+NEIGHBORS_BB: List[int] = [0] * 38
+JUMP_OVER_BB: List[int] = [0] * 38
+CAPTURE_LANDING: Dict[Tuple[int, int], int] = {}
+ADJACENT_PAIRS: List[Tuple[int, int, int | None]] = []
+
+for _node, _edges in RAW_ADJACENCY.items():
+    for _nb, _landing in _edges:
+        NEIGHBORS_BB[_node] |= 1 << _nb
+        ADJACENT_PAIRS.append((_node, _nb, _landing))
+        if _landing is not None:
+            JUMP_OVER_BB[_node] |= 1 << _nb
+            CAPTURE_LANDING[(_node, _nb)] = _landing
+
+
+# JUMP_OVER_BB folded over whole bytes of an occupancy mask: JUMP_REACH_BYTES[k][b]
+# is the set of nodes that the pieces encoded by value b in byte k can jump over
+JUMP_REACH_BYTES: List[List[int]] = []
+for _byte in range(5):
+    _table = [0] * 256
+    for _value in range(1, 256):
+        _low = _value & -_value
+        _node = _byte * 8 + _low.bit_length() - 1
+        _table[_value] = _table[_value ^ _low] | (JUMP_OVER_BB[_node] if _node < 38 else 0)
+    JUMP_REACH_BYTES.append(_table)
+
+
+# Nodes that a set of pieces could jump over, ignoring whether the landing is free;
+# five table lookups instead of a loop over the pieces
+def jump_reach(mask: int) -> int:
+    t0, t1, t2, t3, t4 = JUMP_REACH_BYTES
+    return (
+        t0[mask & 0xFF]
+        | t1[mask >> 8 & 0xFF]
+        | t2[mask >> 16 & 0xFF]
+        | t3[mask >> 24 & 0xFF]
+        | t4[mask >> 32 & 0xFF]
+    )
+
+
+# Frozen per-node tables, indexed 0..37, for the move generators:
+# plain neighbours, and (over, landing) pairs for the jumpable edges
+ADJ: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(nb for nb, _ in RAW_ADJACENCY.get(node, ())) for node in range(38)
+)
+JUMPS: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(
+    tuple((nb, landing) for nb, landing in RAW_ADJACENCY.get(node, ()) if landing is not None)
+    for node in range(38)
+)
+
+
+# Flat CSR layout: the edges of node n sit at ADJ_OFFSETS[n]:ADJ_OFFSETS[n + 1]
+# in ADJ_NEIGHBORS / ADJ_LANDING, with -1 marking an edge that cannot be jumped
+ADJ_OFFSETS = array("i", [0])
+ADJ_NEIGHBORS = array("b")
+ADJ_LANDING = array("b")
+
+for _node in range(38):
+    for _nb, _landing in RAW_ADJACENCY.get(_node, ()):
+        ADJ_NEIGHBORS.append(_nb)
+        ADJ_LANDING.append(-1 if _landing is None else _landing)
+    ADJ_OFFSETS.append(len(ADJ_NEIGHBORS))
+
+_NEIGHBORS_VIEW = memoryview(ADJ_NEIGHBORS)
+_LANDING_VIEW = memoryview(ADJ_LANDING)
 
 
+# Contiguous neighbour and landing slices for a node, without copying
+def neighbors_of(node: int) -> Tuple[memoryview, memoryview]:
+    if node < 1 or node > 37:
+        raise ValueError(f"Unknown node index: {node}")
+    start, end = ADJ_OFFSETS[node], ADJ_OFFSETS[node + 1]
+    return _NEIGHBORS_VIEW[start:end], _LANDING_VIEW[start:end]
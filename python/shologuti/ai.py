@@ -1,16 +1,46 @@
 from __future__ import annotations
 
-import copy
 import math
 import random
+import time
 from dataclasses import dataclass
-from typing import List, Optional
+from threading import Event
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-from .game.board import MoveOption, PlayerId, opponent
-from .game.rules import GameRules
+from . import ai_fast
+from .game.board import ZOBRIST_PENDING, ZOBRIST_SIDE, MoveOption, PlayerId, opponent
+from .game.rules import GameRules, MoveUndo
 
 
-Score = float
+Score = int
+
+# Win/loss sentinel; evaluations stay far below it, so the search never leaves int math
+WIN = 10**9
+
+# Evaluation weight per piece exposed to an enemy jump
+THREAT_WEIGHT = 2
+
+# Extra plies a leaf may be extended while the side to move is forced to capture
+QUIESCENCE_PLIES = 8
+
+# Transposition table bound flags
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+TT_CAPACITY = 1 << 20
+# Turns an entry survives a purge once the table is half full
+TT_KEEP_TURNS = 2
+
+# Playout length cap before a rollout is scored as a draw
+MAX_ROLLOUT_STEPS = 200
+
+
+class TTEntry(NamedTuple):
+    value: Score
+    depth: int
+    flag: int
+    best_move: Optional[MoveOption] = None
+    age: int = 0
 
 
 @dataclass(frozen=True)
@@ -19,8 +49,8 @@ class PlannedMove:
     target: int
 
 
-# Determine if someone already won
-def _winner_for_state(state: GameRules) -> Optional[PlayerId]:
+# Determine if someone already won; pass the side to move's moves if already generated
+def _winner_for_state(state: GameRules, moves: Optional[List[MoveOption]] = None) -> Optional[PlayerId]:
     red_remaining = state.remaining(1)
     green_remaining = state.remaining(2)
 
@@ -31,67 +61,150 @@ def _winner_for_state(state: GameRules) -> Optional[PlayerId]:
     if green_remaining == 0:
         return 1
 
-    if not _generate_moves(state):
+    if moves is None:
+        moves = state.generate_moves()
+    if not moves:
         return opponent(state.turn.to_move)
 
     return None
 
 
-# List legal moves for a player
-def _generate_moves(state: GameRules, for_player: Optional[PlayerId] = None) -> List[MoveOption]:
-    player = state.turn.to_move if for_player is None else for_player
-
-    enforce_origin: Optional[int] = None
-    if player == state.turn.to_move:
-        enforce_origin = state.turn.pending_capture_from
-
-    if enforce_origin is not None:
-        if state.board.occupant(enforce_origin) != player:
-            return []
-        forced = state.board.capture_moves(enforce_origin, player)
-        return forced
-
-    captures: List[MoveOption] = []
-    quiets: List[MoveOption] = []
-    snapshot = state.board.snapshot()
-    for origin, occupant_id in snapshot.items():
-        if occupant_id != player:
-            continue
-        capture_moves = state.board.capture_moves(origin, player)
-        if capture_moves:
-            captures.extend(capture_moves)
+# The only legal move, if there is exactly one; mostly the last hop of a capture chain
+def _forced_move(state: GameRules) -> Optional[PlannedMove]:
+    moves = state.generate_moves()
+    if len(moves) != 1:
+        return None
+    return PlannedMove(origin=moves[0].origin, target=moves[0].target)
+
+
+# Hash board, side to move and capture chain together
+def _position_key(state: GameRules) -> int:
+    pending = state.turn.pending_capture_from
+    return state.board.zhash() ^ ZOBRIST_SIDE[state.turn.to_move] ^ ZOBRIST_PENDING[pending or 0]
+
+
+# Count legal moves for both players, indexed by player id, honouring a pending chain
+def _move_counts(state: GameRules) -> List[int]:
+    board = state.board
+    counts = [0, *board.mobility_counts()]
+
+    pending = state.turn.pending_capture_from
+    if pending is not None:
+        to_move = state.turn.to_move
+        if board.occupant(pending) == to_move:
+            counts[to_move] = len(board.capture_moves(pending, to_move))
         else:
-            quiets.extend(state.board.simple_moves(origin, player))
+            counts[to_move] = 0
+    return counts
+
 
-    if captures:
-        return captures
-    return quiets
+# Put known-good moves at the front so alpha-beta cuts sooner: the table's best move,
+# then any killer moves that are legal here
+def _order_moves(
+    moves: List[MoveOption],
+    first: Optional[MoveOption],
+    killers: Tuple[Optional[MoveOption], ...] = (),
+) -> List[MoveOption]:
+    for move in reversed((first, *killers)):
+        if move is not None and move in moves:
+            moves.remove(move)
+            moves.insert(0, move)
+    return moves
 
 
 class MinimaxAgent:
-    def __init__(self, player: PlayerId, depth: int = 3) -> None:
+    def __init__(self, player: PlayerId, depth: int = 3, time_limit: Optional[float] = None) -> None:
         self.player = player
         self.depth = depth
+        self.time_limit = time_limit
+        # The table outlives a single choose_move, so later turns start from
+        # positions already searched; entries are stamped with the turn counter
+        self._tt: Dict[int, TTEntry] = {}
+        self._age = 0
+        # Two quiet moves per remaining depth that last caused a cutoff
+        self._killers: List[List[Optional[MoveOption]]] = []
+        self._fast = ai_fast.FastMinimax() if ai_fast.AVAILABLE else None
+        # Set by the caller to abandon a search in progress (see choose_move)
+        self._stop: Optional[Event] = None
+
+    def choose_move(self, state: GameRules, stop: Optional[Event] = None) -> Optional[PlannedMove]:
+        # Iterative deepening entry point, reusing the table between depths
+        # The search plays moves for the side to move, which must be this agent.
+        # Setting stop makes a running search return None as soon as it notices
+        if state.turn.to_move != self.player:
+            return None
+        if stop is not None and stop.is_set():
+            return None
 
-    def choose_move(self, state: GameRules) -> Optional[PlannedMove]:
-        # Single-ply search entry point
-        moves = _generate_moves(state)
+        forced = _forced_move(state)
+        if forced is not None:
+            return forced
+
+        if self._fast is not None:
+            found = self._fast.choose_move(state, self.player, self.depth, self.time_limit)
+            if found is None:
+                return None
+            return PlannedMove(origin=found[0], target=found[1])
+
+        self._age += 1
+        if len(self._tt) >= TT_CAPACITY // 2:
+            oldest = self._age - TT_KEEP_TURNS
+            self._tt = {key: entry for key, entry in self._tt.items() if entry.age >= oldest}
+        moves = self._root_order(state, state.generate_moves())
         if not moves:
             return None
 
-        best_score = -math.inf
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        root_key = _position_key(state)
         best_move: Optional[MoveOption] = None
+        # Deepen in steps of two: the evaluation swings between odd and even
+        # plies, so same-parity iterations give the most useful ordering hints
+        target_depth = max(1, self.depth)
+        self._stop = stop
+        try:
+            for depth in range(2 - target_depth % 2, target_depth + 1, 2):
+                self._killers = [[None, None] for _ in range(depth + 1)]
+                entry = self._tt.get(root_key)
+                moves = _order_moves(moves, entry.best_move if entry is not None else None)
+                score, found = self._search_root(state, moves, depth)
+                if stop is not None and stop.is_set():
+                    # Scores from the cut-off search reached the table; drop it
+                    self._tt = {}
+                    return None
+                if found is None:
+                    break
+                best_move = found
+                self._store(root_key, TTEntry(score, depth, TT_EXACT, found, self._age))
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        finally:
+            self._stop = None
+
+        if best_move is None:
+            return None
 
-        alpha = -math.inf
-        beta = math.inf
+        return PlannedMove(origin=best_move.origin, target=best_move.target)
 
-        for option in moves:
-            child_state = copy.deepcopy(state)
-            result = child_state.apply_player_move(self.player, option.origin, option.target)
-            if not result.legal:
-                continue
+    def _search_root(
+        self,
+        state: GameRules,
+        moves: List[MoveOption],
+        depth: int,
+    ) -> Tuple[Score, Optional[MoveOption]]:
+        # Fixed-depth alpha-beta over the root moves
+        best_score = -WIN
+        best_move: Optional[MoveOption] = None
+
+        # Always open with the full window rather than an aspiration window
+        # around the previous iteration's score; failed narrow windows force
+        # re-searches that cost more than the root's few children save
+        alpha = -WIN
+        beta = WIN
 
-            score = self._minimax(child_state, self.depth - 1, alpha, beta)
+        for option in moves:
+            undo = state.make_move(option)
+            score = self._minimax(state, depth - 1, alpha, beta)
+            state.pop(undo)
 
             if score > best_score or best_move is None:
                 best_score = score
@@ -101,79 +214,150 @@ class MinimaxAgent:
             if beta <= alpha:
                 break
 
-        if best_move is None:
-            return None
+        return best_score, best_move
 
-        return PlannedMove(origin=best_move.origin, target=best_move.target)
+    def _root_order(self, state: GameRules, moves: List[MoveOption]) -> List[MoveOption]:
+        # Sort root moves by a one-ply evaluation, best first
+        scored: List[Tuple[Score, MoveOption]] = []
+        for option in moves:
+            undo = state.make_move(option)
+            scored.append((self._evaluate(state), option))
+            state.pop(undo)
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [option for _, option in scored]
+
+    def _minimax(self, state: GameRules, depth: int, alpha: Score, beta: Score) -> Score:
+        # Depth-limited minimax core with transposition lookups
+        stop = self._stop
+        if stop is not None and stop.is_set():
+            # Unwind quickly; choose_move discards whatever this returns
+            return 0
+        key = _position_key(state)
+        entry = self._tt.get(key)
+        if entry is not None and entry.depth >= depth:
+            if entry.flag == TT_EXACT:
+                return entry.value
+            if entry.flag == TT_LOWER:
+                alpha = max(alpha, entry.value)
+            else:
+                beta = min(beta, entry.value)
+            if alpha >= beta:
+                return entry.value
+
+        hint = entry.best_move if entry is not None else None
+        value, best_move = self._search_node(state, depth, alpha, beta, hint)
+
+        if value <= alpha:
+            flag = TT_UPPER
+        elif value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self._store(key, TTEntry(value, depth, flag, best_move, self._age))
+        return value
 
-    def _minimax(self, state: GameRules, depth: int, alpha: float, beta: float) -> Score:
-        # Depth-limited minimax core
-        winner = _winner_for_state(state)
+    def _store(self, key: int, entry: TTEntry) -> None:
+        # Depth-preferred within a turn, always-replace for older turns;
+        # evict the oldest insertion when full
+        previous = self._tt.get(key)
+        if previous is not None:
+            if previous.age == entry.age and previous.depth > entry.depth:
+                return
+        elif len(self._tt) >= TT_CAPACITY:
+            del self._tt[next(iter(self._tt))]
+        self._tt[key] = entry
+
+    def _search_node(
+        self,
+        state: GameRules,
+        depth: int,
+        alpha: Score,
+        beta: Score,
+        hint: Optional[MoveOption] = None,
+    ) -> Tuple[Score, Optional[MoveOption]]:
+        moves = state.generate_moves()
+        winner = _winner_for_state(state, moves)
         if winner is not None:
             if winner == self.player:
-                return math.inf
-            return -math.inf
+                return WIN, None
+            return -WIN, None
+
+        if not moves:
+            return self._evaluate(state), None
 
-        if depth <= 0:
-            return self._evaluate(state)
+        # Captures are mandatory, so rather than scoring a leaf in the middle of an
+        # exchange, keep following the forced captures (no stand-pat) up to a cap
+        if depth <= 0 and (moves[0].captured is None or depth <= -QUIESCENCE_PLIES):
+            return self._evaluate(state), None
 
         player_to_move = state.turn.to_move
         maximizing = player_to_move == self.player
 
-        moves = _generate_moves(state)
-        if not moves:
-            return self._evaluate(state)
+        if depth > 0:
+            killers = self._killers[depth]
+            moves = _order_moves(moves, hint, (killers[0], killers[1]))
+        else:
+            moves = _order_moves(moves, hint)
 
+        best_move: Optional[MoveOption] = None
         if maximizing:
-            value = -math.inf
-            legal_branch_found = False
+            value = -WIN
             for option in moves:
-                child_state = copy.deepcopy(state)
-                result = child_state.apply_player_move(player_to_move, option.origin, option.target)
-                if not result.legal:
-                    continue
-
-                legal_branch_found = True
-                value = max(value, self._minimax(child_state, depth - 1, alpha, beta))
+                undo = state.make_move(option)
+                score = self._minimax(state, depth - 1, alpha, beta)
+                state.pop(undo)
+                if best_move is None or score > value:
+                    value = score
+                    best_move = option
                 alpha = max(alpha, value)
                 if beta <= alpha:
+                    self._add_killer(depth, option)
                     break
-            if not legal_branch_found:
-                return self._evaluate(state)
-            return value
+            if best_move is None:
+                return self._evaluate(state), None
+            return value, best_move
 
-        value = math.inf
-        legal_branch_found = False
+        value = WIN
         for option in moves:
-            child_state = copy.deepcopy(state)
-            result = child_state.apply_player_move(player_to_move, option.origin, option.target)
-            if not result.legal:
-                continue
-
-            legal_branch_found = True
-            value = min(value, self._minimax(child_state, depth - 1, alpha, beta))
+            undo = state.make_move(option)
+            score = self._minimax(state, depth - 1, alpha, beta)
+            state.pop(undo)
+            if best_move is None or score < value:
+                value = score
+                best_move = option
             beta = min(beta, value)
             if beta <= alpha:
+                self._add_killer(depth, option)
                 break
-        if not legal_branch_found:
-            return self._evaluate(state)
-        return value
+        if best_move is None:
+            return self._evaluate(state), None
+        return value, best_move
+
+    def _add_killer(self, depth: int, option: MoveOption) -> None:
+        # Captures are mandatory whenever available, so only quiet cutoffs are worth remembering
+        if option.captured is not None or depth <= 0:
+            return
+        killers = self._killers[depth]
+        if killers[0] != option:
+            killers[1] = killers[0]
+            killers[0] = option
 
     def _evaluate(self, state: GameRules) -> Score:
-        # Simple material plus mobility score
-        my_pieces = state.remaining(self.player)
-        opp_pieces = state.remaining(opponent(self.player))
-        material = my_pieces - opp_pieces
+        # Material, mobility and exposure to jumps
+        rival = opponent(self.player)
+        material = state.remaining(self.player) - state.remaining(rival)
 
-        my_moves = len(_generate_moves(state, for_player=self.player))
-        opp_moves = len(_generate_moves(state, for_player=opponent(self.player)))
-        mobility = my_moves - opp_moves
+        counts = _move_counts(state)
+        mobility = counts[self.player] - counts[rival]
+
+        board = state.board
+        threats = board.threatened(rival).bit_count() - board.threatened(self.player).bit_count()
 
         pending_bonus = 0
         if state.turn.pending_capture_from is not None and state.turn.to_move == self.player:
             pending_bonus = 1
 
-        return material * 10 + mobility + pending_bonus
+        return material * 10 + mobility + threats * THREAT_WEIGHT + pending_bonus
 
     @property
     def description(self) -> str:
@@ -187,31 +371,69 @@ class _MCTSNode:
         parent: Optional["_MCTSNode"],
         move: Optional[MoveOption],
     ) -> None:
-        self.state = state
+        # Nodes capture what they need from the shared state on creation
         self.parent = parent
         self.move = move
+        self.index = len(parent.children) if parent is not None else 0
         self.children: List[_MCTSNode] = []
-        self.untried_moves: List[MoveOption] = _generate_moves(state)
+        # Child statistics kept side by side for the UCB scan
+        self.child_visits: List[int] = []
+        self.child_wins: List[float] = []
+        self.untried_moves: List[MoveOption] = state.generate_moves()
+        # Same outcome as _winner_for_state, reusing the move list just built
+        self.terminal: bool = not self.untried_moves or state.remaining(1) == 0 or state.remaining(2) == 0
         self.visits: int = 0
-        self.wins: float = 0.0
+
+    def add_child(self, child: "_MCTSNode") -> None:
+        self.children.append(child)
+        self.child_visits.append(0)
+        self.child_wins.append(0.0)
 
     def is_terminal(self) -> bool:
-        if _winner_for_state(self.state) is not None:
-            return True
-        return len(_generate_moves(self.state)) == 0
+        return self.terminal
 
     def is_fully_expanded(self) -> bool:
         return len(self.untried_moves) == 0
 
     def best_child(self, exploration_constant: float) -> "_MCTSNode":
-        def ucb_score(child: _MCTSNode) -> float:
-            if child.visits == 0:
-                return math.inf
-            exploitation = child.wins / child.visits
-            exploration = exploration_constant * math.sqrt(max(math.log(self.visits), 0.0) / child.visits)
-            return exploitation + exploration
-
-        return max(self.children, key=ucb_score)
+        # UCB1 over the parallel arrays with the parent log term computed once;
+        # a batched search can reach a parent before its first backpropagation
+        log_visits = math.log(self.visits) if self.visits > 1 else 0.0
+        best_index = 0
+        best_score = -math.inf
+        for index, (visits, wins) in enumerate(zip(self.child_visits, self.child_wins)):
+            if visits == 0:
+                return self.children[index]
+            score = wins / visits + exploration_constant * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best_score = score
+                best_index = index
+        return self.children[best_index]
+
+    def add_virtual_loss(self) -> None:
+        # Count a visit with no reward up to the root, so that later selections in
+        # the same batch steer away from this path until its playout is scored
+        node: Optional[_MCTSNode] = self
+        while node is not None:
+            node.visits += 1
+            parent = node.parent
+            if parent is not None:
+                parent.child_visits[node.index] += 1
+            node = parent
+
+    def backpropagate(self, reward: float, virtual: bool = False) -> None:
+        # With virtual set, the visits were already counted by add_virtual_loss
+        # and only the reward is added, which takes the virtual loss back out
+        node: Optional[_MCTSNode] = self
+        while node is not None:
+            parent = node.parent
+            if not virtual:
+                node.visits += 1
+                if parent is not None:
+                    parent.child_visits[node.index] += 1
+            if parent is not None:
+                parent.child_wins[node.index] += reward
+            node = parent
 
 
 class MCTSAgent:
@@ -220,38 +442,49 @@ class MCTSAgent:
         player: PlayerId,
         iterations: int = 100,
         exploration_constant: float = math.sqrt(2.0),
+        workers: Optional[int] = None,
     ) -> None:
         self.player = player
         self.iterations = max(1, iterations)
         self.exploration_constant = exploration_constant
-
-    def choose_move(self, state: GameRules) -> Optional[PlannedMove]:
-        # Run the requested number of rollouts
-        root = _MCTSNode(copy.deepcopy(state), parent=None, move=None)
-
-        for _ in range(self.iterations):
-            node = root
-            while node.is_fully_expanded() and not node.is_terminal():
-                if not node.children:
-                    break
-                node = node.best_child(self.exploration_constant)
-            if not node.is_terminal() and node.untried_moves:
-                move_index = random.randrange(len(node.untried_moves))
-                move = node.untried_moves.pop(move_index)
-                next_state = copy.deepcopy(node.state)
-                player_to_move = next_state.turn.to_move
-                result = next_state.apply_player_move(player_to_move, move.origin, move.target)
-                if result.legal:
-                    child = _MCTSNode(next_state, parent=node, move=move)
-                    node.children.append(child)
-                    node = child
-                else:
+        self._rollouts = ai_fast.FastRollouts(workers) if ai_fast.AVAILABLE else None
+
+    def choose_move(self, state: GameRules, stop: Optional[Event] = None) -> Optional[PlannedMove]:
+        # Run the requested number of rollouts on one state, unwinding after each.
+        # With compiled playouts, leaves are collected in batches of one per worker
+        # and played out together, each path holding a virtual loss until it is
+        # scored; the tree itself is only touched on this thread
+        forced = _forced_move(state)
+        if forced is not None:
+            return forced
+
+        root = _MCTSNode(state, parent=None, move=None)
+        batch_size = 1 if self._rollouts is None else self._rollouts.workers
+
+        remaining = self.iterations
+        while remaining > 0:
+            if stop is not None and stop.is_set():
+                # Abandoned by the caller; checked once per batch of playouts
+                return None
+            batch: List[Tuple[_MCTSNode, Tuple[int, int, int, int]]] = []
+            for _ in range(min(batch_size, remaining)):
+                remaining -= 1
+                path: List[MoveUndo] = []
+                node = self._descend(state, root, path)
+                if self._rollouts is not None:
+                    node.add_virtual_loss()
+                    batch.append((node, self._rollouts.leaf(state)))
+                    self._unwind(state, path)
                     continue
-            reward = self._rollout(node.state)
-            while node is not None:
-                node.visits += 1
-                node.wins += reward
-                node = node.parent
+                reward = self._rollout(state)
+                self._unwind(state, path)
+                node.backpropagate(reward)
+
+            if batch:
+                seeds = [random.getrandbits(31) for _ in batch]
+                rewards = self._rollouts.run([leaf for _, leaf in batch], self.player, MAX_ROLLOUT_STEPS, seeds)
+                for (node, _), reward in zip(batch, rewards):
+                    node.backpropagate(reward, virtual=True)
 
         if not root.children:
             return None
@@ -261,33 +494,51 @@ class MCTSAgent:
             return None
         return PlannedMove(origin=best_child.move.origin, target=best_child.move.target)
 
+    def _descend(self, state: GameRules, root: _MCTSNode, path: List[MoveUndo]) -> _MCTSNode:
+        # Selection and expansion, leaving state at the returned leaf
+        node = root
+        while node.is_fully_expanded() and not node.is_terminal():
+            if not node.children:
+                break
+            node = node.best_child(self.exploration_constant)
+            path.append(state.make_move(node.move))
+        if not node.is_terminal() and node.untried_moves:
+            move_index = random.randrange(len(node.untried_moves))
+            move = node.untried_moves.pop(move_index)
+            path.append(state.make_move(move))
+            child = _MCTSNode(state, parent=node, move=move)
+            node.add_child(child)
+            node = child
+        return node
+
+    @staticmethod
+    def _unwind(state: GameRules, path: List[MoveUndo]) -> None:
+        for undo in reversed(path):
+            state.pop(undo)
+
     def _rollout(self, state: GameRules) -> float:
-        # Play random moves until outcome
-        simulation = copy.deepcopy(state)
-        steps = 0
-        max_steps = 200
+        # Play random moves until outcome, then take them all back
+        path: List[MoveUndo] = []
+        reward = 0.5
 
-        while steps < max_steps:
-            winner = _winner_for_state(simulation)
+        while len(path) < MAX_ROLLOUT_STEPS:
+            moves = state.generate_moves()
+            winner = _winner_for_state(state, moves)
             if winner is not None:
                 if winner == self.player:
-                    return 1.0
-                if winner == opponent(self.player):
-                    return 0.0
-                return 0.5
+                    reward = 1.0
+                elif winner == opponent(self.player):
+                    reward = 0.0
+                break
 
-            moves = _generate_moves(simulation)
             if not moves:
-                return 0.5
+                break
 
             move = random.choice(moves)
-            player_to_move = simulation.turn.to_move
-            result = simulation.apply_player_move(player_to_move, move.origin, move.target)
-            if not result.legal:
-                return 0.5
-            steps += 1
+            path.append(state.make_move(move))
 
-        return 0.5
+        self._unwind(state, path)
+        return reward
 
     @property
     def description(self) -> str:
@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from .adjacency import ADJ_LANDING, ADJ_NEIGHBORS, ADJ_OFFSETS, JUMP_REACH_BYTES
+from .game.board import ZOBRIST, ZOBRIST_PENDING, ZOBRIST_SIDE
+from .game.rules import GameRules
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Prebuilt kernels from `python -m shologuti.build_ext`; with them numba is not
+# even imported, so the first move pays no JIT compile
+try:
+    from . import _search_aot
+except ImportError:
+    _search_aot = None
+
+njit = None
+if _search_aot is None:
+    try:
+        from numba import njit
+    except ImportError:
+        pass
+
+# Compiled kernels are used when they were built ahead of time or numba can JIT them
+AVAILABLE = np is not None and (_search_aot is not None or njit is not None)
+
+MAX_MOVES = 128
+MAX_DEPTH = 64
+TT_BITS = 18
+TT_EXACT = 1
+TT_LOWER = 2
+TT_UPPER = 3
+WIN = 10**9
+THREAT_WEIGHT = 2
+QUIESCENCE_PLIES = 8
+
+
+# Count set bits without relying on int.bit_count inside compiled code
+def _popcount(mask):
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+# Nodes a set of pieces could jump over, as adjacency.jump_reach
+def _jump_reach(mask):
+    reach = 0
+    for k in range(5):
+        reach |= _JUMP_REACH[k, (mask >> (8 * k)) & 0xFF]
+    return reach
+
+
+# Append captures from one origin; rows are (origin, target, captured)
+def _captures_from(origin, enemies, occupied, out, n):
+    for k in range(_OFFSETS[origin], _OFFSETS[origin + 1]):
+        landing = _LANDING[k]
+        if landing < 0:
+            continue
+        nb = _NEIGHBOR[k]
+        if (enemies >> nb) & 1 and not (occupied >> landing) & 1:
+            out[n, 0] = origin
+            out[n, 1] = landing
+            out[n, 2] = nb
+            n += 1
+    return n
+
+
+# Same moves, in the same order, as GameRules.generate_moves; pending 0 means none
+def gen_moves(red, green, side, pending, out):
+    mine = red if side == 1 else green
+    enemies = green if side == 1 else red
+    occupied = red | green
+
+    if pending > 0:
+        if not (mine >> pending) & 1:
+            return 0
+        return _captures_from(pending, enemies, occupied, out, 0)
+
+    n = 0
+    for origin in range(1, 38):
+        if (mine >> origin) & 1:
+            n = _captures_from(origin, enemies, occupied, out, n)
+    if n:
+        return n
+
+    for origin in range(1, 38):
+        if not (mine >> origin) & 1:
+            continue
+        for k in range(_OFFSETS[origin], _OFFSETS[origin + 1]):
+            nb = _NEIGHBOR[k]
+            if not (occupied >> nb) & 1:
+                out[n, 0] = origin
+                out[n, 1] = nb
+                out[n, 2] = 0
+                n += 1
+    return n
+
+
+# Number of legal moves for player, honouring a pending chain for the side to move
+def count_moves(red, green, side, pending, player):
+    mine = red if player == 1 else green
+    enemies = green if player == 1 else red
+    occupied = red | green
+
+    if player == side and pending > 0:
+        if not (mine >> pending) & 1:
+            return 0
+        count = 0
+        for k in range(_OFFSETS[pending], _OFFSETS[pending + 1]):
+            landing = _LANDING[k]
+            if landing >= 0 and (enemies >> _NEIGHBOR[k]) & 1 and not (occupied >> landing) & 1:
+                count += 1
+        return count
+
+    captures = 0
+    quiets = 0
+    for origin in range(1, 38):
+        if not (mine >> origin) & 1:
+            continue
+        for k in range(_OFFSETS[origin], _OFFSETS[origin + 1]):
+            nb = _NEIGHBOR[k]
+            landing = _LANDING[k]
+            if landing >= 0 and (enemies >> nb) & 1 and not (occupied >> landing) & 1:
+                captures += 1
+            elif captures == 0 and not (occupied >> nb) & 1:
+                quiets += 1
+    if captures:
+        return captures
+    return quiets
+
+
+# Mirror of MinimaxAgent._evaluate
+def evaluate(red, green, side, pending, player):
+    mine = red if player == 1 else green
+    theirs = green if player == 1 else red
+    material = _popcount(mine) - _popcount(theirs)
+    mobility = count_moves(red, green, side, pending, player) - count_moves(red, green, side, pending, 3 - player)
+    threats = _popcount(theirs & _jump_reach(mine)) - _popcount(mine & _jump_reach(theirs))
+    bonus = 1 if pending > 0 and side == player else 0
+    return material * 10 + mobility + threats * THREAT_WEIGHT + bonus
+
+
+# Apply a generated move, returning (red, green, side, pending)
+def apply_move(red, green, side, origin, target, captured):
+    step = (1 << origin) | (1 << target)
+    if side == 1:
+        red ^= step
+        if captured:
+            green &= ~(1 << captured)
+    else:
+        green ^= step
+        if captured:
+            red &= ~(1 << captured)
+
+    if captured:
+        enemies = green if side == 1 else red
+        if enemies:
+            occupied = red | green
+            for k in range(_OFFSETS[target], _OFFSETS[target + 1]):
+                landing = _LANDING[k]
+                if landing >= 0 and (enemies >> _NEIGHBOR[k]) & 1 and not (occupied >> landing) & 1:
+                    return red, green, side, target
+    return red, green, 3 - side, 0
+
+
+# Incremental Zobrist update matching ai._position_key
+def child_key(key, side, pending, origin, target, captured, new_side, new_pending):
+    key ^= _ZOBRIST[origin, side] ^ _ZOBRIST[target, side]
+    if captured:
+        key ^= _ZOBRIST[captured, 3 - side]
+    key ^= _ZOBRIST_SIDE[side] ^ _ZOBRIST_SIDE[new_side]
+    key ^= _ZOBRIST_PENDING[pending] ^ _ZOBRIST_PENDING[new_pending]
+    return key
+
+
+# Move the row whose packed origin*64+target equals packed to index front, keeping
+# the others in order; returns the next free front index
+def _move_to_front(moves, n, front, packed):
+    for i in range(front, n):
+        if moves[i, 0] * 64 + moves[i, 1] == packed:
+            origin = moves[i, 0]
+            target = moves[i, 1]
+            captured = moves[i, 2]
+            for k in range(i, front, -1):
+                moves[k, 0] = moves[k - 1, 0]
+                moves[k, 1] = moves[k - 1, 1]
+                moves[k, 2] = moves[k - 1, 2]
+            moves[front, 0] = origin
+            moves[front, 1] = target
+            moves[front, 2] = captured
+            return front + 1
+    return front
+
+
+# Alpha-beta with an open-addressed table, same values as MinimaxAgent._minimax
+def ab_search(
+    red, green, side, pending, key, player, depth, alpha, beta,
+    tt_keys, tt_vals, tt_depths, tt_flags, tt_moves, killers,
+):
+    slot = key & _TT_MASK
+    hint = -1
+    if tt_flags[slot] != 0 and tt_keys[slot] == key:
+        hint = tt_moves[slot]
+        if tt_depths[slot] >= depth:
+            value = tt_vals[slot]
+            if tt_flags[slot] == TT_EXACT:
+                return value
+            if tt_flags[slot] == TT_LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+    moves = np.empty((MAX_MOVES, 3), np.int64)
+    n = gen_moves(red, green, side, pending, moves)
+    reds = _popcount(red)
+    greens = _popcount(green)
+
+    best = -1
+    if reds == 0 and greens != 0:
+        value = WIN if player == 2 else -WIN
+    elif greens == 0 and reds != 0:
+        value = WIN if player == 1 else -WIN
+    elif n == 0 and reds != 0:
+        value = -WIN if side == player else WIN
+    elif n == 0 or (depth <= 0 and (moves[0, 2] == 0 or depth <= -QUIESCENCE_PLIES)):
+        # Leaves in the middle of a forced capture sequence are extended, as in ai.py
+        value = evaluate(red, green, side, pending, player)
+    else:
+        # Table move first, then this depth's killers, as in ai._order_moves
+        front = 0
+        if hint >= 0:
+            front = _move_to_front(moves, n, front, hint)
+        for k in range(2 if depth > 0 else 0):
+            if killers[depth, k] >= 0 and killers[depth, k] != hint:
+                front = _move_to_front(moves, n, front, killers[depth, k])
+
+        maximizing = side == player
+        value = -WIN if maximizing else WIN
+        low = alpha
+        high = beta
+        for i in range(n):
+            origin = moves[i, 0]
+            target = moves[i, 1]
+            captured = moves[i, 2]
+            c_red, c_green, c_side, c_pending = apply_move(red, green, side, origin, target, captured)
+            c_key = child_key(key, side, pending, origin, target, captured, c_side, c_pending)
+            score = ab_search(
+                c_red, c_green, c_side, c_pending, c_key, player, depth - 1, low, high,
+                tt_keys, tt_vals, tt_depths, tt_flags, tt_moves, killers,
+            )
+            if maximizing:
+                if best < 0 or score > value:
+                    value = score
+                    best = i
+                low = max(low, value)
+            else:
+                if best < 0 or score < value:
+                    value = score
+                    best = i
+                high = min(high, value)
+            if high <= low:
+                # Quiet cutoff moves become killers for this depth
+                packed = origin * 64 + target
+                if captured == 0 and depth > 0 and killers[depth, 0] != packed:
+                    killers[depth, 1] = killers[depth, 0]
+                    killers[depth, 0] = packed
+                break
+
+    if value <= alpha:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    tt_keys[slot] = key
+    tt_vals[slot] = value
+    tt_depths[slot] = depth
+    tt_flags[slot] = flag
+    tt_moves[slot] = moves[best, 0] * 64 + moves[best, 1] if best >= 0 else -1
+    return value
+
+
+# One deepening iteration at the root; returns (score, origin, target)
+def search_root(
+    red, green, side, pending, key, player, depth,
+    tt_keys, tt_vals, tt_depths, tt_flags, tt_moves, killers,
+):
+    moves = np.empty((MAX_MOVES, 3), np.int64)
+    n = gen_moves(red, green, side, pending, moves)
+    if n == 0:
+        return -WIN, 0, 0
+
+    # One-ply evaluation order, stable so ties keep generator order
+    scores = np.empty(n, np.int64)
+    for i in range(n):
+        c_red, c_green, c_side, c_pending = apply_move(red, green, side, moves[i, 0], moves[i, 1], moves[i, 2])
+        scores[i] = evaluate(c_red, c_green, c_side, c_pending, player)
+    order = np.argsort(-scores, kind="mergesort")
+
+    slot = key & _TT_MASK
+    if tt_flags[slot] != 0 and tt_keys[slot] == key:
+        hint = tt_moves[slot]
+        for i in range(n):
+            idx = order[i]
+            if moves[idx, 0] * 64 + moves[idx, 1] == hint:
+                for j in range(i, 0, -1):
+                    order[j] = order[j - 1]
+                order[0] = idx
+                break
+
+    best_score = -WIN
+    best = -1
+    alpha = -WIN
+    beta = WIN
+    for i in range(n):
+        idx = order[i]
+        origin = moves[idx, 0]
+        target = moves[idx, 1]
+        captured = moves[idx, 2]
+        c_red, c_green, c_side, c_pending = apply_move(red, green, side, origin, target, captured)
+        c_key = child_key(key, side, pending, origin, target, captured, c_side, c_pending)
+        score = ab_search(
+            c_red, c_green, c_side, c_pending, c_key, player, depth - 1, alpha, beta,
+            tt_keys, tt_vals, tt_depths, tt_flags, tt_moves, killers,
+        )
+        if best < 0 or score > best_score:
+            best_score = score
+            best = idx
+        alpha = max(alpha, best_score)
+
+    tt_keys[slot] = key
+    tt_vals[slot] = best_score
+    tt_depths[slot] = depth
+    tt_flags[slot] = TT_EXACT
+    tt_moves[slot] = moves[best, 0] * 64 + moves[best, 1]
+    return best_score, moves[best, 0], moves[best, 1]
+
+
+# Random playout mirroring MCTSAgent._rollout; returns the reward for player
+def rollout(red, green, side, pending, player, max_steps, seed):
+    np.random.seed(seed)
+    moves = np.empty((MAX_MOVES, 3), np.int64)
+    for _ in range(max_steps):
+        reds = _popcount(red)
+        greens = _popcount(green)
+        if reds == 0 or greens == 0:
+            if reds == greens:
+                return 0.5
+            winner = 2 if reds == 0 else 1
+            return 1.0 if winner == player else 0.0
+        n = gen_moves(red, green, side, pending, moves)
+        if n == 0:
+            return 0.0 if side == player else 1.0
+        i = np.random.randint(0, n)
+        red, green, side, pending = apply_move(red, green, side, moves[i, 0], moves[i, 1], moves[i, 2])
+    return 0.5
+
+
+class FastRollouts:
+    def __init__(self, workers: Optional[int] = None) -> None:
+        # The kernel releases the GIL, so plain threads run playouts in parallel
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    @staticmethod
+    def leaf(state: GameRules) -> Tuple[int, int, int, int]:
+        # Plain-int copy of a position, safe to hand to another thread
+        red, green = state.board.masks()
+        return red, green, state.turn.to_move, state.turn.pending_capture_from or 0
+
+    def run(
+        self,
+        leaves: Sequence[Tuple[int, int, int, int]],
+        player: int,
+        max_steps: int,
+        seeds: Sequence[int],
+    ) -> List[float]:
+        jobs = [(*leaf, player, max_steps, seed) for leaf, seed in zip(leaves, seeds)]
+        if self._pool is None or len(jobs) == 1:
+            return [rollout(*job) for job in jobs]
+        return list(self._pool.map(lambda job: rollout(*job), jobs))
+
+
+class FastMinimax:
+    def __init__(self) -> None:
+        size = 1 << TT_BITS
+        self._tt_keys = np.zeros(size, np.uint64)
+        self._tt_vals = np.zeros(size, np.int64)
+        self._tt_depths = np.zeros(size, np.int32)
+        self._tt_flags = np.zeros(size, np.int8)
+        self._tt_moves = np.zeros(size, np.int64)
+        # Two packed killer moves per remaining depth, -1 for none
+        self._killers = np.full((MAX_DEPTH + 1, 2), -1, np.int64)
+
+    def clear(self) -> None:
+        # The table is kept between moves and slots are always-replace,
+        # so stale entries simply get overwritten; this is a hard reset
+        self._tt_flags.fill(0)
+
+    def choose_move(
+        self,
+        state: GameRules,
+        player: int,
+        depth: int,
+        time_limit: Optional[float] = None,
+    ) -> Optional[Tuple[int, int]]:
+        # Same-parity iterative deepening, as in MinimaxAgent.choose_move
+        board = state.board
+        red, green = board.masks()
+        side = state.turn.to_move
+        pending = state.turn.pending_capture_from or 0
+        key = np.uint64(board.zhash() ^ ZOBRIST_SIDE[side] ^ ZOBRIST_PENDING[pending])
+
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        best: Optional[Tuple[int, int]] = None
+        target_depth = min(max(1, depth), MAX_DEPTH)
+        for current in range(2 - target_depth % 2, target_depth + 1, 2):
+            self._killers.fill(-1)
+            _, origin, target = search_root(
+                red, green, side, pending, key, player, current,
+                self._tt_keys, self._tt_vals, self._tt_depths, self._tt_flags, self._tt_moves,
+                self._killers,
+            )
+            if origin == 0:
+                break
+            best = (int(origin), int(target))
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return best
+
+
+if np is not None:
+    _OFFSETS = np.array(ADJ_OFFSETS, np.int64)
+    _NEIGHBOR = np.array(ADJ_NEIGHBORS, np.int64)
+    _LANDING = np.array(ADJ_LANDING, np.int64)
+    _JUMP_REACH = np.array(JUMP_REACH_BYTES, np.int64)
+
+    _ZOBRIST = np.array([list(keys) for keys in ZOBRIST], np.uint64)
+    _ZOBRIST_SIDE = np.array(ZOBRIST_SIDE, np.uint64)
+    _ZOBRIST_PENDING = np.array(ZOBRIST_PENDING, np.uint64)
+    _TT_MASK = np.uint64((1 << TT_BITS) - 1)
+
+# Uncompiled entry points, which build_ext hands to numba.pycc
+_AOT_EXPORTS = {"search_root": search_root, "rollout": rollout}
+
+if njit is not None:
+    _jit = njit(cache=True, nogil=True)
+    _popcount = _jit(_popcount)
+    _jump_reach = _jit(_jump_reach)
+    _captures_from = _jit(_captures_from)
+    _move_to_front = _jit(_move_to_front)
+    gen_moves = _jit(gen_moves)
+    count_moves = _jit(count_moves)
+    evaluate = _jit(evaluate)
+    apply_move = _jit(apply_move)
+    child_key = _jit(child_key)
+    # The recursive kernel gets an explicit signature; lazily typed self-recursion
+    # does not reload reliably from numba's on-disk cache
+    ab_search = njit(
+        "int64(int64, int64, int64, int64, uint64, int64, int64, int64, int64, "
+        "uint64[:], int64[:], int32[:], int8[:], int64[:], int64[:, :])",
+        cache=True,
+        nogil=True,
+    )(ab_search)
+    search_root = _jit(search_root)
+    rollout = _jit(rollout)
+
+if _search_aot is not None:
+    # pycc exports hold the GIL, so FastRollouts threads run these one at a time
+    search_root = _search_aot.search_root
+    rollout = _search_aot.rollout
+
+
+__all__ = ["AVAILABLE", "FastMinimax", "FastRollouts"]
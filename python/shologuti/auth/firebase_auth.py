@@ -30,6 +30,18 @@ class FirebaseAuthClient:
                 "Firebase API key missing. Set the FIREBASE_WEB_API_KEY environment variable."
             )
         self.timeout = timeout
+        # One keep-alive session, so back-to-back calls reuse the TLS connection
+        self._session = requests.Session()
+        self._session.headers["Content-Type"] = "application/json"
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "FirebaseAuthClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def register_user(self, name: str, email: str, password: str) -> FirebaseUser:
         # Create an email/password account
@@ -92,7 +104,7 @@ class FirebaseAuthClient:
         # Minimal wrapper over the REST call
         url = f"{self._IDENTITY_BASE_URL}/{path}?key={self.api_key}"
         try:
-            response = requests.post(url, json=payload, timeout=self.timeout)
+            response = self._session.post(url, json=payload, timeout=self.timeout)
         except requests.RequestException as exc:
             raise FirebaseAuthError("Could not reach Firebase Authentication service.") from exc
 
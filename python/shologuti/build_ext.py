@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+# Ahead-of-time build of the search and rollout kernels into shologuti/_search_aot,
+# so the first AI move does not pay numba's JIT compile. Run with
+#   python -m shologuti.build_ext
+# Building needs numba; the resulting extension only needs numpy at runtime.
+
+import os
+import sys
+
+MODULE_NAME = "_search_aot"
+
+# Hide any previous build so ai_fast JIT-compiles the kernels from source
+sys.modules[f"{__package__}.{MODULE_NAME}"] = None
+
+from . import ai_fast  # noqa: E402
+
+SEARCH_ROOT_SIGNATURE = (
+    "UniTuple(int64, 3)(int64, int64, int64, int64, uint64, int64, int64, "
+    "uint64[::1], int64[::1], int32[::1], int8[::1], int64[::1], int64[:, ::1])"
+)
+ROLLOUT_SIGNATURE = "float64(int64, int64, int64, int64, int64, int64, int64)"
+
+
+def build(output_dir: str | None = None) -> None:
+    if ai_fast.njit is None:
+        raise RuntimeError("numba is required to build the search extension: pip install numba")
+
+    from numba.pycc import CC
+
+    cc = CC(MODULE_NAME)
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.export("search_root", SEARCH_ROOT_SIGNATURE)(ai_fast._AOT_EXPORTS["search_root"])
+    cc.export("rollout", ROLLOUT_SIGNATURE)(ai_fast._AOT_EXPORTS["rollout"])
+    cc.compile()
+
+
+def main() -> None:
+    build(sys.argv[1] if len(sys.argv) > 1 else None)
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["build"]
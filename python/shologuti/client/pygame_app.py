@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import copy
 import sys
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field as dc_field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import cached_property, lru_cache
+from threading import Event
+from typing import Deque, Dict, List, Optional, Tuple
 
 try:
     import pygame
@@ -14,10 +18,10 @@ except ImportError as exc:
     ) from exc
 
 from ..adjacency import RAW_ADJACENCY
-from ..ai import MCTSAgent, MinimaxAgent
+from ..ai import MCTSAgent, MinimaxAgent, PlannedMove
 from ..auth.firebase_auth import FirebaseAuthClient, FirebaseAuthError, FirebaseUser
 from ..game.board import MoveOption, PlayerId, opponent
-from ..game.rules import GameRules
+from ..game.rules import GameRules, Snapshot
 
 RAW_GUTI_X = [
     0,
@@ -120,22 +124,146 @@ NODE_COORDS: Dict[int, Tuple[int, int]] = {
     for idx in range(1, len(RAW_GUTI_X))
 }
 
+# Same coordinates as flat per-axis arrays indexed by node (index 0 unused),
+# for the per-frame drawing loops
+NODE_X = array("i", [0] + [NODE_COORDS[idx][0] for idx in range(1, len(RAW_GUTI_X))])
+NODE_Y = array("i", [0] + [NODE_COORDS[idx][1] for idx in range(1, len(RAW_GUTI_Y))])
+
+# Split the edges into a few trails (walks using each edge once) so the board
+# lines go out in a handful of draw.lines calls; greedy walks that start from
+# odd-degree nodes first come close to the minimum of odd_nodes / 2 trails
+def _edge_trails() -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    remaining: Dict[int, List[int]] = {node: [nb for nb, _ in edges] for node, edges in RAW_ADJACENCY.items()}
+    trails: List[Tuple[Tuple[int, int], ...]] = []
+    while True:
+        starts = [node for node, nbs in remaining.items() if nbs]
+        if not starts:
+            return tuple(trails)
+        node = next((n for n in starts if len(remaining[n]) % 2), starts[0])
+        trail = [NODE_COORDS[node]]
+        while remaining[node]:
+            nb = remaining[node].pop()
+            remaining[nb].remove(node)
+            trail.append(NODE_COORDS[nb])
+            node = nb
+        trails.append(tuple(trail))
+
+
+EDGE_TRAILS = _edge_trails()
+
 MIN_X = min(coord[0] for coord in NODE_COORDS.values())
 MAX_X = max(coord[0] for coord in NODE_COORDS.values())
 MIN_Y = min(coord[1] for coord in NODE_COORDS.values())
 MAX_Y = max(coord[1] for coord in NODE_COORDS.values())
 
-BOARD_RECT = pygame.Rect(
+# Board frame geometry as plain data; the pygame.Rect is built on first draw
+BOARD_BOUNDS: Tuple[int, int, int, int] = (
     MIN_X - BOARD_PADDING,
     MIN_Y - BOARD_PADDING,
     (MAX_X - MIN_X) + 2 * BOARD_PADDING,
     (MAX_Y - MIN_Y) + 2 * BOARD_PADDING,
 )
 
+
+@lru_cache(maxsize=None)
+def board_rect() -> pygame.Rect:
+    return pygame.Rect(*BOARD_BOUNDS)
+
+
+# Greedy word wrap of text to max_width pixels, memoised per (font, text, width)
+@lru_cache(maxsize=128)
+def wrap_text(font: pygame.font.Font, text: str, max_width: int) -> Tuple[str, ...]:
+    words = text.split()
+    if not words:
+        return ()
+
+    # Bisect for the longest run of words that fits each line: O(log words)
+    # font.size calls per line. The first word always stays on its line even
+    # when it overflows on its own.
+    lines: List[str] = []
+    start = 0
+    count = len(words)
+    while start < count:
+        low, high = start + 1, count
+        while low < high:
+            mid = (low + high + 1) // 2
+            if font.size(" ".join(words[start:mid]))[0] <= max_width:
+                low = mid
+            else:
+                high = mid - 1
+        lines.append(" ".join(words[start:low]))
+        start = low
+    return tuple(lines)
+
+
+# Anti-aliased text surfaces shared across frames; callers only blit them
+@lru_cache(maxsize=256)
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    return font.render(text, True, color).convert_alpha()
+
+
+# Auth panel chrome (drop shadow, rounded card, accent strip) baked onto the
+# screen background once per panel size; it covers the shadow's offset too
+@lru_cache(maxsize=4)
+def auth_panel_surface(width: int, height: int) -> pygame.Surface:
+    surface = pygame.Surface((width + 6, height + 8)).convert()
+    surface.fill(SCREEN_BG)
+
+    shadow_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(shadow_surface, (0, 0, 0, 70), shadow_surface.get_rect(), border_radius=28)
+    surface.blit(shadow_surface, (6, 8))
+
+    panel_rect = pygame.Rect(0, 0, width, height)
+    pygame.draw.rect(surface, (244, 245, 248), panel_rect, border_radius=24)
+    pygame.draw.rect(surface, (176, 190, 197), panel_rect, width=2, border_radius=24)
+
+    accent_rect = pygame.Rect(28, 24, width - 56, 6)
+    pygame.draw.rect(surface, (30, 136, 229), accent_rect, border_radius=3)
+    return surface
+
+
+# Translucent rounded bubble behind auth status and error messages
+@lru_cache(maxsize=8)
+def message_bubble(
+    size: Tuple[int, int], fill: Tuple[int, int, int, int], border: Tuple[int, int, int, int]
+) -> pygame.Surface:
+    surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+    pygame.draw.rect(surface, fill, surface.get_rect(), border_radius=14)
+    pygame.draw.rect(surface, border, surface.get_rect(), width=1, border_radius=14)
+    return surface
+
+
 WINDOW_WIDTH = 1020
 WINDOW_HEIGHT = 760
+SIDEBAR_BOUNDS: Tuple[int, int, int, int] = (
+    SIDEBAR_PADDING,
+    SIDEBAR_PADDING,
+    SIDEBAR_WIDTH,
+    WINDOW_HEIGHT - 2 * SIDEBAR_PADDING,
+)
 FPS = 30
+IDLE_WAIT_MS = 500
+
+# Event types the main loop acts on; everything else is dropped in SDL without
+# being turned into Python objects (hover is read from pygame.mouse instead)
+HANDLED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+BLOCKED_EVENTS = (
+    pygame.ACTIVEEVENT,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL,
+    pygame.JOYAXISMOTION,
+    pygame.JOYBALLMOTION,
+    pygame.JOYHATMOTION,
+    pygame.JOYBUTTONDOWN,
+    pygame.JOYBUTTONUP,
+    pygame.FINGERMOTION,
+    pygame.FINGERDOWN,
+    pygame.FINGERUP,
+)
+HISTORY_LIMIT = 40
 
+SCREEN_BG = (21, 34, 45)
 BOARD_BG = (243, 243, 243)
 LINE_COLOR = (120, 144, 156)
 PIECE_COLORS = {1: (211, 47, 47), 2: (46, 125, 50)}
@@ -148,6 +276,17 @@ TEXT_COLOR = (33, 33, 33)
 
 PIECE_RADIUS = 18
 BASE_RADIUS = 6
+SELECTION_RADIUS = PIECE_RADIUS + 5
+HIT_RADIUS = PIECE_RADIUS + 6
+
+# Coarse grid for click hit-testing: each cell lists the nodes whose hit circle
+# overlaps it, so a click only distance-checks one or two candidates
+HIT_CELL = 2 * HIT_RADIUS
+HIT_GRID: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+for _node, (_x, _y) in NODE_COORDS.items():
+    for _cx in range((_x - HIT_RADIUS) // HIT_CELL, (_x + HIT_RADIUS) // HIT_CELL + 1):
+        for _cy in range((_y - HIT_RADIUS) // HIT_CELL, (_y + HIT_RADIUS) // HIT_CELL + 1):
+            HIT_GRID[(_cx, _cy)] = HIT_GRID.get((_cx, _cy), ()) + (_node,)
 
 AUTH_PANEL_WIDTH = 520
 AUTH_FIELD_WIDTH = 360
@@ -174,32 +313,85 @@ class Button:
     label: str
     rect: pygame.Rect
     base_color: Tuple[int, int, int] = (33, 150, 243)
+    # Pre-rendered button faces (normal, hovered), reused until the label, size, colour or font changes
+    _faces: Optional[Tuple[pygame.Surface, pygame.Surface]] = dc_field(default=None, init=False, repr=False, compare=False)
+    _faces_key: Optional[Tuple[object, ...]] = dc_field(default=None, init=False, repr=False, compare=False)
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font, hovered: bool) -> None:
-        highlight = tuple(min(c + 40, 255) for c in self.base_color)
-        color = highlight if hovered else self.base_color
-        pygame.draw.rect(surface, color, self.rect, border_radius=6)
-        pygame.draw.rect(surface, (13, 71, 161), self.rect, width=2, border_radius=6)
-        text_surf = font.render(self.label, True, (255, 255, 255))
-        surface.blit(text_surf, text_surf.get_rect(center=self.rect.center))
+        surface.blit(self.face(font, hovered), self.rect)
+
+    def face(self, font: pygame.font.Font, hovered: bool) -> pygame.Surface:
+        key = (self.label, self.rect.size, self.base_color, font)
+        if self._faces is None or self._faces_key != key:
+            highlight = tuple(min(c + 40, 255) for c in self.base_color)
+            text_surf = font.render(self.label, True, (255, 255, 255))
+            faces = []
+            for color in (self.base_color, highlight):
+                face = pygame.Surface(self.rect.size, pygame.SRCALPHA).convert_alpha()
+                local = face.get_rect()
+                pygame.draw.rect(face, color, local, border_radius=6)
+                pygame.draw.rect(face, (13, 71, 161), local, width=2, border_radius=6)
+                face.blit(text_surf, text_surf.get_rect(center=local.center))
+                faces.append(face)
+            self._faces = (faces[0], faces[1])
+            self._faces_key = key
+        return self._faces[1] if hovered else self._faces[0]
 
     def contains(self, pos: Tuple[int, int]) -> bool:
         return self.rect.collidepoint(pos)
 
 
+# Draw a row of buttons with a single batched blit
+def draw_buttons(
+    surface: pygame.Surface, buttons: List[Button], font: pygame.font.Font, hovered: Optional[str]
+) -> None:
+    surface.blits([(button.face(font, button.key == hovered), button.rect) for button in buttons], False)
+
+
 @dataclass
 class TextInput:
     key: str
     label: str
     rect: pygame.Rect
     placeholder: str
-    value: str = ""
     is_password: bool = False
     active: bool = False
     max_length: int = 120
+    # Typed characters, edited in place; the joined string is cached until the next edit
+    _chars: List[str] = dc_field(default_factory=list, init=False, repr=False, compare=False)
+    _value: Optional[str] = dc_field(default="", init=False, repr=False, compare=False)
+    # Rendered label and field text, reused until their inputs change
+    _label_surface: Optional[pygame.Surface] = dc_field(default=None, init=False, repr=False, compare=False)
+    _label_key: Optional[Tuple[str, pygame.font.Font]] = dc_field(default=None, init=False, repr=False, compare=False)
+    _text_surface: Optional[pygame.Surface] = dc_field(default=None, init=False, repr=False, compare=False)
+    _text_key: Optional[Tuple[object, ...]] = dc_field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def value(self) -> str:
+        if self._value is None:
+            self._value = "".join(self._chars)
+        return self._value
+
+    @value.setter
+    def value(self, text: str) -> None:
+        self._chars = list(text)
+        self._value = text
+
+    def append(self, char: str) -> None:
+        if len(self._chars) < self.max_length:
+            self._chars.append(char)
+            self._value = None
+
+    def backspace(self) -> None:
+        if self._chars:
+            self._chars.pop()
+            self._value = None
 
     def draw(self, surface: pygame.Surface, label_font: pygame.font.Font, input_font: pygame.font.Font) -> None:
-        label_surface = label_font.render(self.label, True, (55, 71, 79))
+        if self._label_surface is None or self._label_key != (self.label, label_font):
+            self._label_surface = label_font.render(self.label, True, (55, 71, 79)).convert_alpha()
+            self._label_key = (self.label, label_font)
+        label_surface = self._label_surface
         label_rect = label_surface.get_rect()
         label_rect.topleft = (self.rect.x, self.rect.y - label_surface.get_height() - 6)
         surface.blit(label_surface, label_rect)
@@ -219,11 +411,26 @@ class TextInput:
             text_color = (120, 144, 156)
 
         max_width = self.rect.width - 24
-        text_to_render = rendered_value
-        while input_font.size(text_to_render)[0] > max_width and len(text_to_render) > 1:
-            text_to_render = text_to_render[1:]
-
-        text_surface = input_font.render(text_to_render, True, text_color)
+        text_key = (rendered_value, text_color, max_width, input_font)
+        if self._text_surface is None or self._text_key != text_key:
+            # Keep the longest tail that fits: estimate it from summed glyph advances
+            # in one pass, then nudge by the odd character kerning moves either way
+            start = len(rendered_value)
+            width = 0
+            for metrics in reversed(input_font.metrics(rendered_value)):
+                width += metrics[4] if metrics else 0
+                if width > max_width and start < len(rendered_value):
+                    break
+                start -= 1
+            while start < len(rendered_value) - 1 and input_font.size(rendered_value[start:])[0] > max_width:
+                start += 1
+            while start > 0 and input_font.size(rendered_value[start - 1 :])[0] <= max_width:
+                start -= 1
+            text_to_render = rendered_value[start:]
+            self._text_surface = input_font.render(text_to_render, True, text_color).convert_alpha()
+            self._text_key = text_key
+
+        text_surface = self._text_surface
         text_rect = text_surface.get_rect()
         text_rect.topleft = (self.rect.x + 12, self.rect.y + (self.rect.height - text_surface.get_height()) // 2)
         surface.blit(text_surface, text_rect)
@@ -234,6 +441,16 @@ class AuthMode(Enum):
     REGISTER = "register"
 
 
+# Auth fields shown per mode, in tab order, with each key's position
+AUTH_FIELDS: Dict[AuthMode, Tuple[str, ...]] = {
+    AuthMode.LOGIN: ("email", "password"),
+    AuthMode.REGISTER: ("name", "email", "password"),
+}
+AUTH_FIELD_INDEX: Dict[AuthMode, Dict[str, int]] = {
+    mode: {key: index for index, key in enumerate(keys)} for mode, keys in AUTH_FIELDS.items()
+}
+
+
 class GameMode(Enum):
     HUMAN_VS_AI = "human_vs_ai"
     AI_VS_AI = "ai_vs_ai"
@@ -245,11 +462,23 @@ class SixteenPygameApp:
         pygame.display.set_caption("Sixteen - A Game of Tradition")
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.clock = pygame.time.Clock()
+        pygame.event.set_blocked(list(BLOCKED_EVENTS))
+        self._frame_keys: Optional[Tuple[object, object]] = None
+        self._screen_key: Optional[Tuple[object, ...]] = None
+        self._status_cache_key: Optional[Tuple[object, ...]] = None
+        self._hover_key: Optional[Tuple[object, ...]] = None
+        self._hover_rects: Optional[List[pygame.Rect]] = None
+        self._hover_result: Optional[str] = None
+        self._status_blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._status_bottom = 0
+        self._move_cache: Dict[Tuple[int, PlayerId, bool], List[MoveOption]] = {}
+        self._move_cache_hash: Optional[int] = None
 
         self.font_small = pygame.font.Font(None, 24)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_large = pygame.font.Font(None, 48)
         self.sidebar_buttons: List[Button] = []
+        self.sidebar_rects: List[pygame.Rect] = []
         self.button_lookup: Dict[str, Button] = {}
 
         self.auth_mode = AuthMode.LOGIN
@@ -258,6 +487,11 @@ class SixteenPygameApp:
         self.auth_error_message: Optional[str] = None
         self.auth_status_message: Optional[str] = None
         self.auth_loading: bool = False
+        # Sign-in requests run on a worker so the event loop keeps pumping;
+        # the pending future is polled once per frame
+        self._auth_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth")
+        self._auth_future: Optional[Future] = None
+        self._auth_future_mode = AuthMode.LOGIN
         self.auth_submit_button = Button(
             key="auth_submit",
             label="Sign In",
@@ -280,8 +514,17 @@ class SixteenPygameApp:
         self.current_user: Optional[FirebaseUser] = None
         self._configure_auth_inputs()
         self.menu_buttons: List[Button] = []
+        self.menu_rects: List[pygame.Rect] = []
         self._refresh_menu_buttons()
 
+        # AI searches run on a worker on a private copy of the game; the
+        # answer is applied only if the game has not moved on meanwhile
+        self._ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+        self._ai_future: Optional[Future] = None
+        self._ai_request: Optional[Tuple[object, Snapshot]] = None
+        # Set to make the running search give up early
+        self._ai_stop = Event()
+
         self.mode: Optional[GameMode] = None
 
         self.game = GameRules()
@@ -299,9 +542,10 @@ class SixteenPygameApp:
 
         self.selected_origin: Optional[int] = None
         self.highlight_moves: List[MoveOption] = []
+        self._highlight_by_target: Dict[int, MoveOption] = {}
         self.message: Optional[str] = None
 
-        self.history: List[GameRules] = [copy.deepcopy(self.game)]
+        self.history: Deque[Snapshot] = deque([self.game.snapshot()], maxlen=HISTORY_LIMIT)
         self.pending_ai: bool = False
 
     def _build_menu_buttons(self) -> List[Button]:
@@ -330,6 +574,7 @@ class SixteenPygameApp:
 
     def _refresh_menu_buttons(self) -> None:
         self.menu_buttons = self._build_menu_buttons()
+        self.menu_rects = [button.rect for button in self.menu_buttons]
 
     def _create_auth_inputs(self) -> Dict[str, TextInput]:
         # Base text fields for auth screens
@@ -358,10 +603,8 @@ class SixteenPygameApp:
             ),
         }
 
-    def _visible_auth_fields(self) -> List[str]:
-        if self.auth_mode == AuthMode.LOGIN:
-            return ["email", "password"]
-        return ["name", "email", "password"]
+    def _visible_auth_fields(self) -> Tuple[str, ...]:
+        return AUTH_FIELDS[self.auth_mode]
 
     def _configure_auth_inputs(self) -> None:
         # Toggle which auth fields are live
@@ -493,12 +736,12 @@ class SixteenPygameApp:
             self._set_active_input(None)
             return
 
-        if self.active_input_key not in fields or self.active_input_key is None:
+        current_index = AUTH_FIELD_INDEX[self.auth_mode].get(self.active_input_key)
+        if current_index is None:
             target = fields[-1] if backwards else fields[0]
             self._set_active_input(target)
             return
 
-        current_index = fields.index(self.active_input_key)
         if backwards:
             next_index = (current_index - 1) % len(fields)
         else:
@@ -546,15 +789,14 @@ class SixteenPygameApp:
         field = self.auth_inputs[self.active_input_key]
 
         if event.key == pygame.K_BACKSPACE:
-            field.value = field.value[:-1]
+            field.backspace()
             return True
         if event.key == pygame.K_DELETE:
             field.value = ""
             return True
 
         if event.unicode and event.unicode.isprintable():
-            if len(field.value) < field.max_length:
-                field.value += event.unicode
+            field.append(event.unicode)
             return True
 
         return False
@@ -567,6 +809,7 @@ class SixteenPygameApp:
         self.auth_error_message = None
         self.auth_status_message = None
         self.auth_loading = False
+        self._auth_future = None
         self._configure_auth_inputs()
 
     def _submit_auth(self) -> None:
@@ -600,12 +843,24 @@ class SixteenPygameApp:
         self.auth_error_message = None
         self.auth_status_message = "Signing in..." if self.auth_mode == AuthMode.LOGIN else "Creating account..."
         self.auth_loading = True
+        self._auth_future_mode = self.auth_mode
+
+        if self.auth_mode == AuthMode.LOGIN:
+            self._auth_future = self._auth_executor.submit(self.auth_client.login_user, email=email, password=password)
+        else:
+            self._auth_future = self._auth_executor.submit(
+                self.auth_client.register_user, name=name, email=email, password=password
+            )
+
+    def _poll_auth(self) -> None:
+        # Pick up a finished sign-in request
+        future = self._auth_future
+        if future is None or not future.done():
+            return
+        self._auth_future = None
 
         try:
-            if self.auth_mode == AuthMode.LOGIN:
-                user = self.auth_client.login_user(email=email, password=password)
-            else:
-                user = self.auth_client.register_user(name=name, email=email, password=password)
+            user = future.result()
         except FirebaseAuthError as exc:
             self.auth_error_message = str(exc)
             self.auth_status_message = None
@@ -623,7 +878,7 @@ class SixteenPygameApp:
         self.auth_status_message = None
         self.auth_loading = False
         self.auth_inputs["password"].value = ""
-        if self.auth_mode == AuthMode.REGISTER:
+        if self._auth_future_mode == AuthMode.REGISTER:
             self.auth_inputs["name"].value = ""
         self._refresh_menu_buttons()
         self._return_to_menu()
@@ -636,6 +891,7 @@ class SixteenPygameApp:
             self.auth_error_message = None
         self.auth_status_message = None
         self.auth_loading = False
+        self._auth_future = None
         for field in self.auth_inputs.values():
             field.value = ""
         self.auth_mode = AuthMode.LOGIN
@@ -648,6 +904,7 @@ class SixteenPygameApp:
         button_spacing = 12
         if not specs:
             self.sidebar_buttons = []
+            self.sidebar_rects = []
             self.button_lookup = {}
             return
 
@@ -667,6 +924,7 @@ class SixteenPygameApp:
             button = Button(key=key, label=label, rect=rect, base_color=color)
             self.sidebar_buttons.append(button)
             self.button_lookup[key] = button
+        self.sidebar_rects = [button.rect for button in self.sidebar_buttons]
 
     def start_human_mode(self) -> None:
         # Kick off human vs AI
@@ -689,14 +947,15 @@ class SixteenPygameApp:
 
     def _reset_human_game(self) -> None:
         # Reset board for human play
+        self._cancel_ai_search()
         self.game = GameRules()
         if self.human_player == 1:
             self.game.turn.to_move = 1
         self.ai_player = opponent(self.human_player)
         self.agent = MinimaxAgent(self.ai_player, depth=self.minimax_depth)
         self.selected_origin = None
-        self.highlight_moves = []
-        self.history = [copy.deepcopy(self.game)]
+        self._set_highlights([])
+        self.history = deque([self.game.snapshot()], maxlen=HISTORY_LIMIT)
         self.pending_ai = self.game.turn.to_move == self.ai_player
         self.message = "AI to move first..." if self.pending_ai else "Your turn."
 
@@ -726,10 +985,11 @@ class SixteenPygameApp:
 
     def _reset_ai_battle(self) -> None:
         # Reset the AI battle state
+        self._cancel_ai_search()
         self.game = GameRules()
         self.selected_origin = None
-        self.highlight_moves = []
-        self.history = [copy.deepcopy(self.game)]
+        self._set_highlights([])
+        self.history = deque([self.game.snapshot()], maxlen=HISTORY_LIMIT)
         self.pending_ai = False
         self.ai_vs_ai_pause = False
         self.last_ai_tick = pygame.time.get_ticks()
@@ -764,6 +1024,7 @@ class SixteenPygameApp:
         # Adjust minimax depth
         self.minimax_depth = depth
         if self.mode == GameMode.HUMAN_VS_AI:
+            self._cancel_ai_search()
             self.agent = MinimaxAgent(self.ai_player, depth=depth)
             self._refresh_human_sidebar_labels()
             self.message = f"AI depth set to {depth}."
@@ -776,12 +1037,12 @@ class SixteenPygameApp:
             return
         if len(self.history) <= 1:
             return
+        self._cancel_ai_search()
         self.history.pop()
-        restored = copy.deepcopy(self.history[-1])
-        self.game = restored
+        self.game.restore(self.history[-1])
         self.message = "Undid last move."
         self.selected_origin = None
-        self.highlight_moves = []
+        self._set_highlights([])
         self.pending_ai = False
 
     def _cycle_human_depth(self) -> None:
@@ -803,6 +1064,7 @@ class SixteenPygameApp:
             idx = 0
         self.ai_vs_ai_depth = options[(idx + 1) % len(options)]
         if 2 in self.ai_agent_map:
+            self._cancel_ai_search()
             self.ai_agent_map[2] = ("AI 1 (Minimax)", MinimaxAgent(player=2, depth=self.ai_vs_ai_depth))
         self._refresh_ai_vs_ai_sidebar_labels()
         self.message = f"Minimax depth now {self.ai_vs_ai_depth}."
@@ -816,6 +1078,7 @@ class SixteenPygameApp:
             idx = 0
         self.mcts_iterations = options[(idx + 1) % len(options)]
         if 1 in self.ai_agent_map:
+            self._cancel_ai_search()
             self.ai_agent_map[1] = ("AI 2 (MCTS)", MCTSAgent(player=1, iterations=self.mcts_iterations))
         self._refresh_ai_vs_ai_sidebar_labels()
         self.message = f"MCTS iterations now {self.mcts_iterations}."
@@ -829,36 +1092,57 @@ class SixteenPygameApp:
 
     def _return_to_menu(self) -> None:
         # Drop back to the main menu
+        self._cancel_ai_search()
         self.mode = None
         pygame.display.set_caption("Sixteen - A Game of Tradition")
         self._set_sidebar_buttons([])
         self.selected_origin = None
-        self.highlight_moves = []
+        self._set_highlights([])
         self.message = None
         self.pending_ai = False
         self.ai_vs_ai_pause = False
 
     def _push_history(self) -> None:
         # Store snapshots for undo
-        self.history.append(copy.deepcopy(self.game))
-        if len(self.history) > 40:
-            self.history = self.history[-40:]
+        self.history.append(self.game.snapshot())
+
+    def _set_highlights(self, moves: List[MoveOption]) -> None:
+        # Offer moves to the player, indexed by destination for the next click
+        self.highlight_moves = moves
+        self._highlight_by_target = {move.target: move for move in moves}
+
+    def _piece_moves(self, origin: int, captures_only: bool) -> List[MoveOption]:
+        # Moves for one of the human's pieces, memoised until the position changes
+        board = self.game.board
+        if board.zhash() != self._move_cache_hash:
+            self._move_cache.clear()
+            self._move_cache_hash = board.zhash()
+        key = (origin, self.human_player, captures_only)
+        moves = self._move_cache.get(key)
+        if moves is None:
+            moves = board.capture_moves(origin, self.human_player)
+            if not captures_only:
+                simple_moves = board.simple_moves(origin, self.human_player)
+                moves = moves + simple_moves if moves else simple_moves
+            self._move_cache[key] = moves
+        return moves
 
     def handle_click(self, pos: Tuple[int, int]) -> None:
         # Handle clicks based on current mode
         if self.current_user is None:
             return
+        # One C-level collidelist over the cached button rects per click
+        point = pygame.Rect(pos, (1, 1))
         if self.mode is None:
-            for button in self.menu_buttons:
-                if button.contains(pos):
-                    self._handle_menu_button(button)
-                    return
+            index = point.collidelist(self.menu_rects)
+            if index >= 0:
+                self._handle_menu_button(self.menu_buttons[index])
             return
 
-        for button in self.sidebar_buttons:
-            if button.contains(pos):
-                self._handle_button(button)
-                return
+        index = point.collidelist(self.sidebar_rects)
+        if index >= 0:
+            self._handle_button(self.sidebar_buttons[index])
+            return
 
         if self.mode == GameMode.AI_VS_AI:
             return
@@ -869,7 +1153,7 @@ class SixteenPygameApp:
         clicked = self._node_at(pos)
         if clicked is None:
             self.selected_origin = None
-            self.highlight_moves = []
+            self._set_highlights([])
             return
 
         occupant = self.game.board.occupant(clicked)
@@ -879,20 +1163,16 @@ class SixteenPygameApp:
                 if clicked != self.game.turn.pending_capture_from:
                     self.message = "You must continue the capture with the same piece."
                     self.selected_origin = None
-                    self.highlight_moves = []
+                    self._set_highlights([])
                     return
-                moves = self.game.board.capture_moves(clicked, self.human_player)
                 self.selected_origin = clicked
-                self.highlight_moves = moves
+                self._set_highlights(self._piece_moves(clicked, captures_only=True))
                 return
 
-            capture_moves = self.game.board.capture_moves(clicked, self.human_player)
-            simple_moves = self.game.board.simple_moves(clicked, self.human_player)
-
-            moves = capture_moves + simple_moves if capture_moves else simple_moves
+            moves = self._piece_moves(clicked, captures_only=False)
 
             self.selected_origin = clicked
-            self.highlight_moves = moves
+            self._set_highlights(moves)
             if not moves:
                 self.message = "No legal moves for that piece."
             elif self.message == "No legal moves for that piece.":
@@ -902,7 +1182,7 @@ class SixteenPygameApp:
         if self.selected_origin is None:
             return
 
-        move = next((m for m in self.highlight_moves if m.target == clicked), None)
+        move = self._highlight_by_target.get(clicked)
         if move is None:
             return
 
@@ -917,17 +1197,17 @@ class SixteenPygameApp:
         if result.winner is not None:
             self.message = "You win!" if result.winner == self.human_player else "AI wins!"
             self.selected_origin = None
-            self.highlight_moves = []
+            self._set_highlights([])
             self.pending_ai = False
             return
 
         if result.must_continue:
             self.selected_origin = move.target
-            self.highlight_moves = self.game.board.capture_moves(move.target, self.human_player)
+            self._set_highlights(self._piece_moves(move.target, captures_only=True))
             self.message = "Continue capture with the same piece."
         else:
             self.selected_origin = None
-            self.highlight_moves = []
+            self._set_highlights([])
             self.pending_ai = True
 
     def _handle_button(self, button: Button) -> None:
@@ -973,14 +1253,14 @@ class SixteenPygameApp:
         # Check capture continuation rule
         return self.game.turn.pending_capture_from is not None and self.game.turn.to_move == self.human_player
 
-    def update_ai(self) -> None:
-        # Advance AI turns when needed
+    def update_ai(self, now: Optional[int] = None) -> None:
+        # Advance AI turns when needed; now is the frame's pygame tick count
         if self.current_user is None:
             return
         if self.mode == GameMode.HUMAN_VS_AI:
             self._update_human_ai()
         elif self.mode == GameMode.AI_VS_AI:
-            self._update_ai_battle()
+            self._update_ai_battle(pygame.time.get_ticks() if now is None else now)
 
     def _update_human_ai(self) -> None:
         # Let AI respond in human games
@@ -990,10 +1270,12 @@ class SixteenPygameApp:
             self.pending_ai = False
             return
 
-        if not self.message or "thinking" not in self.message.lower():
+        if self.message != "AI thinking...":
             self.message = "AI thinking..."
 
-        planned = self.agent.choose_move(self.game)
+        ready, planned = self._poll_ai_move(self.agent)
+        if not ready:
+            return
         if planned is None:
             self.message = "AI has no legal moves. You win!"
             self.pending_ai = False
@@ -1007,7 +1289,7 @@ class SixteenPygameApp:
             return
 
         self.selected_origin = None
-        self.highlight_moves = []
+        self._set_highlights([])
         self.message = self._format_move_message("AI", planned.origin, planned.target, result.captured)
 
         if result.winner is not None:
@@ -1023,16 +1305,63 @@ class SixteenPygameApp:
             if self.game.turn.to_move == self.human_player:
                 self.message += " | Your turn."
 
-    def _update_ai_battle(self) -> None:
+    def _poll_ai_move(self, agent) -> Tuple[bool, Optional[PlannedMove]]:
+        # Start a search for the current position, or collect a finished one;
+        # returns (ready, move)
+        future = self._ai_future
+        if future is None:
+            self._ai_request = (agent, self.game.snapshot())
+            self._ai_stop = Event()
+            self._ai_future = self._ai_executor.submit(agent.choose_move, self.game.branch(), self._ai_stop)
+            return False, None
+        if not future.done():
+            return False, None
+
+        self._ai_future = None
+        requested_agent, requested_state = self._ai_request
+        if requested_agent is not agent or requested_state != self.game.snapshot():
+            # Game was reset, undone or handed to another agent meanwhile
+            return False, None
+        return True, future.result()
+
+    def _ai_battle_delay(self) -> int:
+        # Pause between AI vs AI moves, shorter inside a capture chain
+        if self.game.turn.pending_capture_from is not None:
+            return max(200, self.ai_move_delay_ms // 2)
+        return self.ai_move_delay_ms
+
+    def _idle_timeout(self) -> int:
+        # How long the loop may sleep waiting for input: 0 while something
+        # advances on its own, else until the next scheduled AI move
+        # A search only counts while its future is still polled: undo clears
+        # pending_ai and pausing skips the battle update, leaving it behind
+        if self._auth_future is not None:
+            return 0
+        if self.current_user is None or self.mode is None:
+            return IDLE_WAIT_MS
+        if self.mode == GameMode.HUMAN_VS_AI:
+            return 0 if self.pending_ai else IDLE_WAIT_MS
+        if self.ai_vs_ai_pause:
+            return IDLE_WAIT_MS
+        if self._ai_future is not None:
+            return 0
+        due = self.last_ai_tick + self._ai_battle_delay() - pygame.time.get_ticks()
+        return min(max(due, 0), IDLE_WAIT_MS)
+
+    def _cancel_ai_search(self) -> None:
+        # Forget any in-flight search; one that has not started yet never runs
+        # and a running one stops at its next check
+        if self._ai_future is not None:
+            self._ai_stop.set()
+            self._ai_future.cancel()
+            self._ai_future = None
+
+    def _update_ai_battle(self, now: int) -> None:
         # Advance AI vs AI playback
         if self.ai_vs_ai_pause:
             return
 
-        now = pygame.time.get_ticks()
-        delay = self.ai_move_delay_ms
-        if self.game.turn.pending_capture_from is not None:
-            delay = max(200, self.ai_move_delay_ms // 2)
-        if now - self.last_ai_tick < delay:
+        if now - self.last_ai_tick < self._ai_battle_delay():
             return
 
         player = self.game.turn.to_move
@@ -1041,7 +1370,9 @@ class SixteenPygameApp:
             return
 
         label, agent = agent_info
-        planned = agent.choose_move(self.game)
+        ready, planned = self._poll_ai_move(agent)
+        if not ready:
+            return
         if planned is None:
             winner = opponent(player)
             winner_label = self.ai_agent_map.get(winner, (f"Player {winner}", None))[0]
@@ -1059,7 +1390,7 @@ class SixteenPygameApp:
             return
 
         self.selected_origin = None
-        self.highlight_moves = []
+        self._set_highlights([])
         self.message = self._format_move_message(label, planned.origin, planned.target, result.captured)
 
         if result.winner is not None:
@@ -1070,38 +1401,130 @@ class SixteenPygameApp:
 
         if result.must_continue:
             self.message += " | Continuing capture..."
-            self.last_ai_tick = pygame.time.get_ticks() - self.ai_move_delay_ms // 2
+            self.last_ai_tick = now - self.ai_move_delay_ms // 2
         else:
-            self.last_ai_tick = pygame.time.get_ticks()
-
-    def draw(self) -> None:
-        # Render current screen state
+            self.last_ai_tick = now
+
+    def draw(self) -> Optional[List[pygame.Rect]]:
+        # Render current screen state; returns the regions that changed since the
+        # last frame, or None when the whole window has to be presented
+        hovered = self._hovered_button(pygame.mouse.get_pos())
+        if self.current_user is None or self.mode is None:
+            # Auth and menu screens: repaint in full, but only when what they show changed
+            self._frame_keys = None
+            screen_key = self._static_screen_key(hovered)
+            if screen_key == self._screen_key:
+                return []
+            self._screen_key = screen_key
+            if self.current_user is None:
+                self._draw_auth_screen(hovered)
+            else:
+                self._draw_menu(hovered)
+            return None
+        self._screen_key = None
+
+        # The game screen only changes in the board and sidebar panels; redraw
+        # each one over the cached backdrop when the state it shows changes
+        board_key = (
+            self.game.board.masks(),
+            self.selected_origin,
+            tuple((option.target, option.captured) for option in self.highlight_moves),
+        )
+        sidebar_key = (
+            self.mode,
+            self.message,
+            self.game.board.masks(),
+            self.game.turn.to_move,
+            self.human_player,
+            self.minimax_depth,
+            self.ai_vs_ai_depth,
+            self.mcts_iterations,
+            self.ai_vs_ai_pause,
+            tuple(button.label for button in self.sidebar_buttons),
+            hovered,
+        )
+        previous = self._frame_keys
+        self._frame_keys = (board_key, sidebar_key)
+        background = self._game_background
+
+        if previous is None:
+            self.screen.blit(background, (0, 0))
+            self._draw_pieces()
+            self._draw_highlights()
+            self._draw_ui(hovered)
+            return None
+
+        dirty: List[pygame.Rect] = []
+        if board_key != previous[0]:
+            area = board_rect()
+            self.screen.blit(background, area, area)
+            self._draw_pieces()
+            self._draw_highlights()
+            dirty.append(area)
+        if sidebar_key != previous[1]:
+            area = pygame.Rect(*SIDEBAR_BOUNDS)
+            self.screen.blit(background, area, area)
+            self._draw_ui(hovered)
+            dirty.append(area)
+        return dirty
+
+    def _hovered_button(self, mouse_pos: Tuple[int, int]) -> Optional[str]:
+        # Key of the visible button under the mouse, if any; reused while neither
+        # the mouse nor the button layout has moved since the last frame
+        rects = self.menu_rects if self.mode is None else self.sidebar_rects
         if self.current_user is None:
-            self._draw_auth_screen()
-            return
-        if self.mode is None:
-            self._draw_menu()
-            return
-
-        self.screen.fill((250, 250, 250))
+            # The auth buttons are laid out again in place every frame
+            hover_key: Tuple[object, ...] = (
+                mouse_pos,
+                tuple(self.auth_submit_button.rect),
+                tuple(self.auth_toggle_button.rect),
+            )
+        else:
+            hover_key = (mouse_pos, self.mode)
+        if hover_key == self._hover_key and rects is self._hover_rects:
+            return self._hover_result
 
-        sidebar_rect = pygame.Rect(
-            SIDEBAR_PADDING,
-            SIDEBAR_PADDING,
-            SIDEBAR_WIDTH,
-            WINDOW_HEIGHT - 2 * SIDEBAR_PADDING,
+        result: Optional[str] = None
+        if self.current_user is None:
+            for button in (self.auth_submit_button, self.auth_toggle_button):
+                if button.contains(mouse_pos):
+                    result = button.key
+                    break
+        else:
+            buttons = self.menu_buttons if self.mode is None else self.sidebar_buttons
+            index = pygame.Rect(mouse_pos, (1, 1)).collidelist(rects)
+            if index >= 0:
+                result = buttons[index].key
+
+        self._hover_key = hover_key
+        self._hover_rects = rects
+        self._hover_result = result
+        return result
+
+    def _static_screen_key(self, hovered: Optional[str]) -> Tuple[object, ...]:
+        # Everything the auth or menu screen depends on
+        if self.current_user is None:
+            return (
+                self.auth_mode,
+                tuple(self.auth_panel_rect),
+                tuple((field.value, field.active) for field in self.auth_inputs.values()),
+                self.auth_error_message,
+                self.auth_status_message,
+                self.auth_loading,
+                hovered,
+            )
+        return (
+            self.current_user.display_name or self.current_user.email,
+            tuple(button.label for button in self.menu_buttons),
+            hovered,
         )
-        pygame.draw.rect(self.screen, SIDEBAR_BG, sidebar_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (189, 189, 189), sidebar_rect, width=2, border_radius=12)
 
-        pygame.draw.rect(self.screen, BOARD_BG, BOARD_RECT, border_radius=12)
-        pygame.draw.rect(self.screen, (189, 189, 189), BOARD_RECT, width=2, border_radius=12)
-
-        self._draw_edges()
-        self._draw_nodes()
-        self._draw_pieces()
-        self._draw_highlights()
-        self._draw_ui()
+    def present(self, dirty: Optional[List[pygame.Rect]]) -> None:
+        # Push a frame from draw() to the window
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
 
     # Draw text with manual wrapping
     def _render_wrapped_text(
@@ -1117,25 +1540,12 @@ class SixteenPygameApp:
         if not text or rect.height <= 0:
             return rect.top
 
-        words = text.split()
-        if not words:
+        lines = wrap_text(font, text, rect.width)
+        if not lines:
             return rect.top
 
-        lines: List[str] = []
-        current_line = words[0]
-        max_width = rect.width
-
-        for word in words[1:]:
-            candidate = f"{current_line} {word}"
-            if font.size(candidate)[0] <= max_width:
-                current_line = candidate
-            else:
-                lines.append(current_line)
-                current_line = word
-        lines.append(current_line)
-
-        line_heights = [font.size(line)[1] for line in lines]
-        total_height = sum(line_heights) + line_spacing * (len(lines) - 1)
+        surfaces = [render_text(font, line, color) for line in lines]
+        total_height = sum(surface.get_height() for surface in surfaces) + line_spacing * (len(lines) - 1)
 
         if valign == "center":
             y = rect.centery - total_height // 2
@@ -1146,8 +1556,7 @@ class SixteenPygameApp:
 
         y = max(rect.top, y)
 
-        for line in lines:
-            rendered = font.render(line, True, color)
+        for rendered in surfaces:
             if align == "center":
                 line_rect = rendered.get_rect(centerx=rect.centerx, top=y)
             elif align == "right":
@@ -1163,52 +1572,42 @@ class SixteenPygameApp:
 
         return y
 
-    def _draw_menu(self) -> None:
+    def _draw_menu(self, hovered: Optional[str]) -> None:
         # Render the main menu
-        self.screen.fill((21, 34, 45))
-        title_surface = self.font_large.render("Sixteen - A Game of Tradition", True, (236, 239, 241))
+        self.screen.fill(SCREEN_BG)
+        title_surface = render_text(self.font_large, "Sixteen - A Game of Tradition", (236, 239, 241))
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 3))
         self.screen.blit(title_surface, title_rect)
 
-        subtitle_surface = self.font_medium.render("Choose a mode to begin", True, (176, 190, 197))
+        subtitle_surface = render_text(self.font_medium, "Choose a mode to begin", (176, 190, 197))
         subtitle_rect = subtitle_surface.get_rect(center=(WINDOW_WIDTH // 2, title_rect.bottom + 40))
         self.screen.blit(subtitle_surface, subtitle_rect)
 
         if self.current_user is not None:
             display_name = self.current_user.display_name or self.current_user.email
-            user_surface = self.font_small.render(f"Signed in as {display_name}", True, (144, 164, 174))
+            user_surface = render_text(self.font_small, f"Signed in as {display_name}", (144, 164, 174))
             user_rect = user_surface.get_rect()
             user_rect.topright = (WINDOW_WIDTH - 50, 50)
             self.screen.blit(user_surface, user_rect)
 
-        mouse_pos = pygame.mouse.get_pos()
-        for button in self.menu_buttons:
-            button.draw(self.screen, self.font_medium, button.contains(mouse_pos))
+        draw_buttons(self.screen, self.menu_buttons, self.font_medium, hovered)
 
-        footer_text = self.font_small.render("Press Esc to quit", True, (144, 164, 174))
+        footer_text = render_text(self.font_small, "Press Esc to quit", (144, 164, 174))
         footer_rect = footer_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 60))
         self.screen.blit(footer_text, footer_rect)
 
-    def _draw_auth_screen(self) -> None:
+    def _draw_auth_screen(self, hovered: Optional[str]) -> None:
         # Draw the login/register screen
-        self.screen.fill((21, 34, 45))
+        self.screen.fill(SCREEN_BG)
 
         panel_rect = self.auth_panel_rect
         if panel_rect.height <= 0:
             return
 
-        shadow_surface = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surface, (0, 0, 0, 70), shadow_surface.get_rect(), border_radius=28)
-        self.screen.blit(shadow_surface, (panel_rect.x + 6, panel_rect.y + 8))
-
-        pygame.draw.rect(self.screen, (244, 245, 248), panel_rect, border_radius=24)
-        pygame.draw.rect(self.screen, (176, 190, 197), panel_rect, width=2, border_radius=24)
-
-        accent_rect = pygame.Rect(panel_rect.x + 28, panel_rect.y + 24, panel_rect.width - 56, 6)
-        pygame.draw.rect(self.screen, (30, 136, 229), accent_rect, border_radius=3)
+        self.screen.blit(auth_panel_surface(panel_rect.width, panel_rect.height), panel_rect.topleft)
 
         title_text = "Sign in to play" if self.auth_mode == AuthMode.LOGIN else "Create your account"
-        title_surface = self.font_large.render(title_text, True, (38, 50, 56))
+        title_surface = render_text(self.font_large, title_text, (38, 50, 56))
         title_rect = title_surface.get_rect(midtop=(panel_rect.centerx, panel_rect.top + AUTH_PANEL_TOP_PADDING))
         self.screen.blit(title_surface, title_rect)
 
@@ -1216,11 +1615,10 @@ class SixteenPygameApp:
             subtitle_text = "Use your email and password to continue"
         else:
             subtitle_text = "Just name, email, and password to get started"
-        subtitle_surface = self.font_small.render(subtitle_text, True, (84, 110, 122))
+        subtitle_surface = render_text(self.font_small, subtitle_text, (84, 110, 122))
         subtitle_rect = subtitle_surface.get_rect(midtop=(panel_rect.centerx, title_rect.bottom + AUTH_TITLE_GAP))
         self.screen.blit(subtitle_surface, subtitle_rect)
 
-        mouse_pos = pygame.mouse.get_pos()
         for key in self._visible_auth_fields():
             self.auth_inputs[key].draw(self.screen, self.font_small, self.font_medium)
 
@@ -1245,11 +1643,8 @@ class SixteenPygameApp:
 
         if message_text and self.auth_message_rect.height > 0:
             bubble_rect = self.auth_message_rect.inflate(0, 12)
-            bubble_surface = pygame.Surface(bubble_rect.size, pygame.SRCALPHA)
             bubble_color = (*message_bg, 220) if message_bg else (255, 255, 255, 220)
-            pygame.draw.rect(bubble_surface, bubble_color, bubble_surface.get_rect(), border_radius=14)
-            pygame.draw.rect(bubble_surface, border_color, bubble_surface.get_rect(), width=1, border_radius=14)
-            self.screen.blit(bubble_surface, bubble_rect.topleft)
+            self.screen.blit(message_bubble(bubble_rect.size, bubble_color, border_color), bubble_rect.topleft)
 
             self._render_wrapped_text(
                 message_text,
@@ -1261,116 +1656,156 @@ class SixteenPygameApp:
                 valign="center",
             )
 
-        self.auth_submit_button.draw(self.screen, self.font_medium, self.auth_submit_button.contains(mouse_pos))
-        self.auth_toggle_button.draw(self.screen, self.font_small, self.auth_toggle_button.contains(mouse_pos))
+        self.auth_submit_button.draw(self.screen, self.font_medium, hovered == self.auth_submit_button.key)
+        self.auth_toggle_button.draw(self.screen, self.font_small, hovered == self.auth_toggle_button.key)
 
         footer_y = self.auth_panel_rect.bottom + 36
-        footer_text = self.font_small.render("Press Esc to quit", True, (144, 164, 174))
+        footer_text = render_text(self.font_small, "Press Esc to quit", (144, 164, 174))
         footer_rect = footer_text.get_rect(center=(WINDOW_WIDTH // 2, footer_y))
         self.screen.blit(footer_text, footer_rect)
 
-    def _draw_edges(self) -> None:
+    @cached_property
+    def _game_background(self) -> pygame.Surface:
+        # Window fill, panels, edges and node markers never change; render them once,
+        # on the first game frame (like the sprites below), so the menu never pays for them
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill((250, 250, 250))
+
+        sidebar_rect = pygame.Rect(*SIDEBAR_BOUNDS)
+        pygame.draw.rect(background, SIDEBAR_BG, sidebar_rect, border_radius=12)
+        pygame.draw.rect(background, (189, 189, 189), sidebar_rect, width=2, border_radius=12)
+
+        pygame.draw.rect(background, BOARD_BG, board_rect(), border_radius=12)
+        pygame.draw.rect(background, (189, 189, 189), board_rect(), width=2, border_radius=12)
+
+        self._draw_edges(background)
+        self._draw_nodes(background)
+        return background
+
+    def _draw_edges(self, surface: pygame.Surface) -> None:
         # Draw board connections
-        for node, edges in RAW_ADJACENCY.items():
-            x1, y1 = NODE_COORDS[node]
-            for neighbor in edges:
-                nb = neighbor[0]
-                if nb <= node:
-                    continue
-                x2, y2 = NODE_COORDS[nb]
-                pygame.draw.line(self.screen, LINE_COLOR, (x1, y1), (x2, y2), 3)
+        for trail in EDGE_TRAILS:
+            pygame.draw.lines(surface, LINE_COLOR, False, trail, 3)
 
-    def _draw_nodes(self) -> None:
+    def _draw_nodes(self, surface: pygame.Surface) -> None:
         # Draw board node markers
-        for node, (x, y) in NODE_COORDS.items():
-            pygame.draw.circle(self.screen, EMPTY_NODE_FILL, (x, y), BASE_RADIUS)
-            pygame.draw.circle(self.screen, (84, 110, 122), (x, y), BASE_RADIUS, 1)
+        for x, y in zip(NODE_X[1:], NODE_Y[1:]):
+            pygame.draw.circle(surface, EMPTY_NODE_FILL, (x, y), BASE_RADIUS)
+            pygame.draw.circle(surface, (84, 110, 122), (x, y), BASE_RADIUS, 1)
+
+    @cached_property
+    def _piece_sprites(self) -> Dict[PlayerId, pygame.Surface]:
+        # Render each side's piece (fill + outline) once
+        size = 2 * PIECE_RADIUS + 2
+        sprites: Dict[PlayerId, pygame.Surface] = {}
+        for player, color in PIECE_COLORS.items():
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+            center = (PIECE_RADIUS + 1, PIECE_RADIUS + 1)
+            pygame.draw.circle(sprite, color, center, PIECE_RADIUS)
+            pygame.draw.circle(sprite, PIECE_OUTLINE, center, PIECE_RADIUS, 3)
+            sprites[player] = sprite
+        return sprites
+
+    @cached_property
+    def _selection_sprite(self) -> pygame.Surface:
+        # Ring drawn around the selected piece
+        size = 2 * SELECTION_RADIUS + 2
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        center = (SELECTION_RADIUS + 1, SELECTION_RADIUS + 1)
+        pygame.draw.circle(sprite, SELECTION_COLOR, center, SELECTION_RADIUS, width=3)
+        return sprite
 
     def _draw_pieces(self) -> None:
-        # Draw pieces and selection
-        snapshot = self.game.board.snapshot()
-        for node, occupant in snapshot.items():
-            if occupant is None:
-                continue
-            x, y = NODE_COORDS[node]
-            color = PIECE_COLORS.get(occupant, (120, 120, 120))
-            pygame.draw.circle(self.screen, color, (x, y), PIECE_RADIUS)
-            pygame.draw.circle(self.screen, PIECE_OUTLINE, (x, y), PIECE_RADIUS, 3)
-
+        # Draw pieces and selection, walking each side's occupancy bitmask so
+        # empty nodes are never visited
+        offset = PIECE_RADIUS + 1
+        board = self.game.board
+        blits = []
+        for player, sprite in self._piece_sprites.items():
+            blits.extend((sprite, (NODE_X[node] - offset, NODE_Y[node] - offset)) for node in board.pieces(player))
         if self.selected_origin is not None:
-            x, y = NODE_COORDS[self.selected_origin]
-            pygame.draw.circle(self.screen, SELECTION_COLOR, (x, y), PIECE_RADIUS + 5, width=3)
+            ring_offset = SELECTION_RADIUS + 1
+            node = self.selected_origin
+            blits.append((self._selection_sprite, (NODE_X[node] - ring_offset, NODE_Y[node] - ring_offset)))
+        self.screen.blits(blits, False)
+
+    @cached_property
+    def _highlight_sprites(self) -> Tuple[pygame.Surface, pygame.Surface]:
+        # Translucent move and capture markers, rendered once
+        sprites = []
+        for color in (HIGHLIGHT_MOVE, HIGHLIGHT_CAPTURE):
+            sprite = pygame.Surface((PIECE_RADIUS * 3, PIECE_RADIUS * 3), pygame.SRCALPHA).convert_alpha()
+            center = PIECE_RADIUS * 3 // 2
+            pygame.draw.circle(sprite, color, (center, center), PIECE_RADIUS - 2)
+            sprites.append(sprite)
+        return sprites[0], sprites[1]
 
     def _draw_highlights(self) -> None:
         # Show available move destinations
-        for option in self.highlight_moves:
-            target = option.target
-            x, y = NODE_COORDS[target]
-            surf = pygame.Surface((PIECE_RADIUS * 3, PIECE_RADIUS * 3), pygame.SRCALPHA)
-            color = HIGHLIGHT_CAPTURE if option.captured is not None else HIGHLIGHT_MOVE
-            pygame.draw.circle(
-                surf,
-                color,
-                (PIECE_RADIUS * 1.5, PIECE_RADIUS * 1.5),
-                PIECE_RADIUS - 2,
-            )
-            self.screen.blit(surf, (x - PIECE_RADIUS * 1.5, y - PIECE_RADIUS * 1.5))
+        move_sprite, capture_sprite = self._highlight_sprites
+        offset = PIECE_RADIUS * 3 // 2
+        self.screen.blits(
+            [
+                (
+                    capture_sprite if option.captured is not None else move_sprite,
+                    (NODE_X[option.target] - offset, NODE_Y[option.target] - offset),
+                )
+                for option in self.highlight_moves
+            ],
+            False,
+        )
 
-    def _draw_ui(self) -> None:
+    def _draw_ui(self, hovered: Optional[str]) -> None:
         # Update sidebar panel
-        mouse_pos = pygame.mouse.get_pos()
 
         text_x = SIDEBAR_PADDING + 16
         cursor_y = SIDEBAR_PADDING + 16
         max_text_width = SIDEBAR_WIDTH - 32
 
-        def draw_wrapped(text: str, font: pygame.font.Font, color: Tuple[int, int, int], top: int) -> int:
-            if not text:
-                return top
-            words = text.split()
-            if not words:
-                return top
-
-            lines: List[str] = []
-            current = words[0]
-            for word in words[1:]:
-                extended = f"{current} {word}"
-                if font.size(extended)[0] <= max_text_width:
-                    current = extended
-                else:
-                    lines.append(current)
-                    current = word
-            lines.append(current)
-
-            y_pos = top
-            for line_text in lines:
-                surface = font.render(line_text, True, color)
-                self.screen.blit(surface, (text_x, y_pos))
-                y_pos += surface.get_height() + 4
-            return y_pos
-
-        if self.mode == GameMode.HUMAN_VS_AI:
-            status_lines = [
-                "Mode: Human vs AI",
-                f"Playing as {'Green (2)' if self.human_player == 2 else 'Red (1)'}",
-                f"Turn: {'You' if self.game.turn.to_move == self.human_player else 'AI'}",
-                f"AI depth: {self.minimax_depth}",
-            ]
-        else:
-            current_label = self.ai_agent_map.get(
-                self.game.turn.to_move, (f"Player {self.game.turn.to_move}", None)
-            )[0]
-            status_lines = [
-                "Mode: AI vs AI",
-                f"Turn: {current_label}",
-                f"Minimax depth: {self.ai_vs_ai_depth}",
-                f"MCTS iterations: {self.mcts_iterations}",
-                f"Paused: {'Yes' if self.ai_vs_ai_pause else 'No'}",
-            ]
-
-        for line in status_lines:
-            cursor_y = draw_wrapped(line, self.font_medium, TEXT_COLOR, cursor_y)
-            cursor_y += 4
+        # Status lines only change with the turn or the settings; keep their
+        # rendered lines and positions until one of those does
+        to_move = self.game.turn.to_move
+        status_key = (
+            self.mode,
+            self.human_player,
+            to_move,
+            self.minimax_depth,
+            self.ai_vs_ai_depth,
+            self.mcts_iterations,
+            self.ai_vs_ai_pause,
+            self.ai_agent_map.get(to_move, (None,))[0],
+        )
+        if status_key != self._status_cache_key:
+            if self.mode == GameMode.HUMAN_VS_AI:
+                status_lines = [
+                    "Mode: Human vs AI",
+                    f"Playing as {'Green (2)' if self.human_player == 2 else 'Red (1)'}",
+                    f"Turn: {'You' if to_move == self.human_player else 'AI'}",
+                    f"AI depth: {self.minimax_depth}",
+                ]
+            else:
+                current_label = self.ai_agent_map.get(to_move, (f"Player {to_move}", None))[0]
+                status_lines = [
+                    "Mode: AI vs AI",
+                    f"Turn: {current_label}",
+                    f"Minimax depth: {self.ai_vs_ai_depth}",
+                    f"MCTS iterations: {self.mcts_iterations}",
+                    f"Paused: {'Yes' if self.ai_vs_ai_pause else 'No'}",
+                ]
+
+            status_blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+            for line in status_lines:
+                for line_text in wrap_text(self.font_medium, line, max_text_width):
+                    surface = render_text(self.font_medium, line_text, TEXT_COLOR)
+                    status_blits.append((surface, (text_x, cursor_y)))
+                    cursor_y += surface.get_height() + 4
+                cursor_y += 4
+            self._status_cache_key = status_key
+            self._status_blits = status_blits
+            self._status_bottom = cursor_y
+
+        self.screen.blits(self._status_blits, doreturn=False)
+        cursor_y = self._status_bottom
 
         cursor_y += 8
 
@@ -1407,18 +1842,19 @@ class SixteenPygameApp:
             counts_rect = pygame.Rect(text_x, counts_top, max_text_width, counts_available)
             self._render_wrapped_text(counts_text, self.font_small, TEXT_COLOR, counts_rect, line_spacing=4)
 
-        for button in self.sidebar_buttons:
-            button.draw(self.screen, self.font_small, button.contains(mouse_pos))
+        draw_buttons(self.screen, self.sidebar_buttons, self.font_small, hovered)
 
     def _node_at(self, pos: Tuple[int, int]) -> Optional[int]:
         # Locate a node by mouse position
         mx, my = pos
-        for node, (x, y) in NODE_COORDS.items():
-            if (mx - x) ** 2 + (my - y) ** 2 <= (PIECE_RADIUS + 6) ** 2:
+        for node in HIT_GRID.get((mx // HIT_CELL, my // HIT_CELL), ()):
+            x, y = NODE_COORDS[node]
+            if (mx - x) ** 2 + (my - y) ** 2 <= HIT_RADIUS * HIT_RADIUS:
                 return node
         return None
 
     @staticmethod
+    @lru_cache(maxsize=512)
     def _format_move_message(actor: str, origin: int, target: int, captured: Optional[int]) -> str:
         # Build readable move text
         if captured is None:
@@ -1431,10 +1867,26 @@ class SixteenPygameApp:
         while running:
             if self.current_user is None:
                 self._layout_auth_controls()
-            for event in pygame.event.get():
+            events = pygame.event.get(HANDLED_EVENTS)
+            pygame.event.clear()
+            timeout = self._idle_timeout() if not events else 0
+            if timeout > 0:
+                # Nothing to animate: sleep until input arrives or the next AI move is due;
+                # mouse motion also wakes the loop so hover states repaint
+                event = pygame.event.wait(timeout)
+                if event.type in HANDLED_EVENTS:
+                    events = [event]
+                events += pygame.event.get(HANDLED_EVENTS)
+                pygame.event.clear()
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                     continue
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # Window contents were lost; present the next frame in full
+                    self._frame_keys = None
+                    self._screen_key = None
+                    continue
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     if self.current_user is None or self.mode is None:
                         running = False
@@ -1452,11 +1904,17 @@ class SixteenPygameApp:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     self.handle_click(event.pos)
 
-            self.update_ai()
-            self.draw()
-            pygame.display.flip()
+            self._poll_auth()
+            self.update_ai(pygame.time.get_ticks())
+            self.present(self.draw())
             self.clock.tick(FPS)
 
+        # The worker threads are joined at interpreter exit, so stop the search first
+        self._cancel_ai_search()
+        self._auth_executor.shutdown(wait=False, cancel_futures=True)
+        self._ai_executor.shutdown(wait=False, cancel_futures=True)
+        if self.auth_client is not None:
+            self.auth_client.close()
         pygame.quit()
         sys.exit(0)
 
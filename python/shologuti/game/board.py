@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from ..adjacency import Edge, neighbors
+from ..adjacency import ADJ, JUMP_OVER_BB, JUMPS, NEIGHBORS_BB, jump_reach
 
 
 PlayerId = int
 
 
+# Fixed-seed Zobrist keys so hashes are stable between runs
+_ZOBRIST_RNG = random.Random(0x5106)
+ZOBRIST: List[Tuple[int, int, int]] = [(0, 0, 0)] + [
+    (0, _ZOBRIST_RNG.getrandbits(64), _ZOBRIST_RNG.getrandbits(64)) for _ in range(1, 38)
+]
+ZOBRIST_SIDE: Tuple[int, int, int] = (0, _ZOBRIST_RNG.getrandbits(64), _ZOBRIST_RNG.getrandbits(64))
+ZOBRIST_PENDING: List[int] = [0] + [_ZOBRIST_RNG.getrandbits(64) for _ in range(1, 38)]
+
+
 # Flip between players
 def opponent(player: PlayerId) -> PlayerId:
-    return 2 if player == 1 else 1
+    # Player ids are 1 and 2; hot paths below inline the same 3 - player
+    return 3 - player
 
 
 @dataclass(frozen=True)
@@ -30,30 +41,112 @@ class MoveResult:
     error: Optional[str] = None
 
 
+# Bits for the starting layout
+_INITIAL_RED = sum(1 << i for i in range(1, 17))
+_INITIAL_GREEN = sum(1 << i for i in range(22, 38))
+
+
 class BoardState:
     def __init__(self) -> None:
-        self._slots: Dict[int, Optional[PlayerId]] = {i: None for i in range(1, 38)}
+        # One occupancy bitmask per player id; index 0 is unused
+        self._masks: List[int] = [0, 0, 0]
+        self._zhash = 0
+        self._view: Tuple[Optional[PlayerId], ...] = ()
+        self._view_masks: Tuple[int, int] = (-1, -1)
         self.reset()
 
     def reset(self) -> None:
         # Rebuild the initial layout
-        for i in self._slots:
-            self._slots[i] = None
-
-        for i in range(1, 17):
-            self._slots[i] = 1
-
-        for i in range(22, 38):
-            self._slots[i] = 2
+        self._masks = [0, _INITIAL_RED, _INITIAL_GREEN]
+
+        self._zhash = 0
+        for i in range(1, 38):
+            occupant = self.occupant(i)
+            if occupant is not None:
+                self._zhash ^= ZOBRIST[i][occupant]
+
+    def copy(self) -> "BoardState":
+        # Two ints and a hash, so copying is O(1)
+        clone = BoardState.__new__(BoardState)
+        clone._masks = list(self._masks)
+        clone._zhash = self._zhash
+        clone._view = self._view
+        clone._view_masks = self._view_masks
+        return clone
 
     def snapshot(self) -> Dict[int, Optional[PlayerId]]:
-        return dict(self._slots)
+        return {i: self.occupant(i) for i in range(1, 38)}
+
+    def view(self) -> Tuple[Optional[PlayerId], ...]:
+        # Read-only occupant per node (index 0 unused); the tuple is shared
+        # and only rebuilt when the masks have changed since the last call
+        masks = (self._masks[1], self._masks[2])
+        if masks != self._view_masks:
+            self._view = tuple(self.occupant(i) for i in range(38))
+            self._view_masks = masks
+        return self._view
 
     def occupant(self, node: int) -> Optional[PlayerId]:
-        return self._slots.get(node)
+        if node < 1 or node > 37:
+            return None
+        bit = 1 << node
+        if self._masks[1] & bit:
+            return 1
+        if self._masks[2] & bit:
+            return 2
+        return None
 
     def set_occupant(self, node: int, player: Optional[PlayerId]) -> None:
-        self._slots[node] = player
+        # Keep the Zobrist hash in step with the slot change
+        previous = self.occupant(node)
+        bit = 1 << node
+        if previous is not None:
+            self._zhash ^= ZOBRIST[node][previous]
+            self._masks[previous] &= ~bit
+        if player is not None:
+            self._zhash ^= ZOBRIST[node][player]
+            self._masks[player] |= bit
+
+    def move_piece(self, player: PlayerId, origin: int, target: int, captured: Optional[int] = None) -> None:
+        # Unchecked relocation for moves that are already known to be legal
+        enemy = 3 - player
+        self._masks[player] ^= (1 << origin) | (1 << target)
+        self._zhash ^= ZOBRIST[origin][player] ^ ZOBRIST[target][player]
+        if captured is not None:
+            self._masks[enemy] &= ~(1 << captured)
+            self._zhash ^= ZOBRIST[captured][enemy]
+
+    def unmove_piece(self, player: PlayerId, origin: int, target: int, captured: Optional[int] = None) -> None:
+        # Exact inverse of move_piece
+        enemy = 3 - player
+        self._masks[player] ^= (1 << origin) | (1 << target)
+        self._zhash ^= ZOBRIST[origin][player] ^ ZOBRIST[target][player]
+        if captured is not None:
+            self._masks[enemy] |= 1 << captured
+            self._zhash ^= ZOBRIST[captured][enemy]
+
+    def zhash(self) -> int:
+        return self._zhash
+
+    def pieces(self, player: PlayerId) -> List[int]:
+        # Nodes held by a player, ascending, read straight off the bitmask
+        nodes: List[int] = []
+        mask = self._masks[player]
+        while mask:
+            low = mask & -mask
+            nodes.append(low.bit_length() - 1)
+            mask ^= low
+        return nodes
+
+    def masks(self) -> Tuple[int, int]:
+        # Red and green occupancy bitmasks
+        return self._masks[1], self._masks[2]
+
+    def load_masks(self, red: int, green: int, zhash: int) -> None:
+        # Overwrite the position with masks (and their hash) taken from masks()/zhash()
+        self._masks[1] = red
+        self._masks[2] = green
+        self._zhash = zhash
 
     def simple_moves(self, origin: int, player: PlayerId) -> List[MoveOption]:
         # Non-capturing moves from a node
@@ -61,9 +154,12 @@ class BoardState:
         if self.occupant(origin) != player:
             return moves
 
-        for edge in neighbors(origin):
-            if self.occupant(edge.neighbor) is None:
-                moves.append(MoveOption(origin=origin, target=edge.neighbor, captured=None))
+        occupied = self._masks[1] | self._masks[2]
+        if not NEIGHBORS_BB[origin] & ~occupied:
+            return moves
+        for nb in ADJ[origin]:
+            if not occupied >> nb & 1:
+                moves.append(MoveOption(origin=origin, target=nb, captured=None))
         return moves
 
     def capture_moves(self, origin: int, player: PlayerId) -> List[MoveOption]:
@@ -72,14 +168,39 @@ class BoardState:
         if self.occupant(origin) != player:
             return moves
 
-        for edge in neighbors(origin):
-            if edge.landing is None:
-                continue
-            mid = self.occupant(edge.neighbor)
-            if mid == opponent(player) and self.occupant(edge.landing) is None:
-                moves.append(MoveOption(origin=origin, target=edge.landing, captured=edge.neighbor))
+        enemies = self._masks[3 - player]
+        if not JUMP_OVER_BB[origin] & enemies:
+            return moves
+        occupied = self._masks[1] | self._masks[2]
+        for nb, landing in JUMPS[origin]:
+            if enemies >> nb & 1 and not occupied >> landing & 1:
+                moves.append(MoveOption(origin=origin, target=landing, captured=nb))
         return moves
 
+    def mobility_counts(self) -> Tuple[int, int]:
+        # Red and green move counts in one pass, counting instead of building options;
+        # a side with any capture only counts its captures, as capture is mandatory
+        occupied = self._masks[1] | self._masks[2]
+        counts = [0, 0, 0]
+        for player in (1, 2):
+            enemies = self._masks[3 - player]
+            captures = 0
+            quiets = 0
+            for origin in self.pieces(player):
+                for nb, landing in JUMPS[origin]:
+                    if enemies >> nb & 1 and not occupied >> landing & 1:
+                        captures += 1
+                if not captures:
+                    for nb in ADJ[origin]:
+                        if not occupied >> nb & 1:
+                            quiets += 1
+            counts[player] = captures or quiets
+        return counts[1], counts[2]
+
+    def threatened(self, player: PlayerId) -> int:
+        # Mask of player's pieces that sit on an enemy jump line, landing not checked
+        return self._masks[player] & jump_reach(self._masks[3 - player])
+
     def legal_moves(
         self,
         origin: int,
@@ -125,7 +246,7 @@ class BoardState:
         return MoveResult(legal=True, captured=captured, must_continue=must_continue, winner=winner)
 
     def remaining(self, player: PlayerId) -> int:
-        return sum(1 for slot in self._slots.values() if slot == player)
+        return self._masks[player].bit_count()
 
     def _check_winner(self) -> Optional[PlayerId]:
         # Detect empty sides
@@ -141,9 +262,7 @@ class BoardState:
 
     def any_capture_available(self, player: PlayerId) -> bool:
         # Quick scan for mandatory captures
-        for origin, occupant in self._slots.items():
-            if occupant != player:
-                continue
+        for origin in self.pieces(player):
             if self.capture_moves(origin, player):
                 return True
         return False
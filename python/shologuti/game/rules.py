@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from .board import BoardState, MoveResult, PlayerId
+from .board import BoardState, MoveOption, MoveResult, PlayerId
 
 
 @dataclass
@@ -14,7 +14,21 @@ class TurnState:
     def swap_turn(self) -> None:
         # Reset capture chain and swap side
         self.pending_capture_from = None
-        self.to_move = 2 if self.to_move == 1 else 1
+        self.to_move = 3 - self.to_move
+
+
+# Flat, immutable game state: (red mask, green mask, zobrist hash, to_move, pending_capture_from)
+Snapshot = Tuple[int, int, int, PlayerId, Optional[int]]
+
+
+@dataclass(frozen=True)
+class MoveUndo:
+    player: PlayerId
+    origin: int
+    target: int
+    captured: Optional[int]
+    prev_to_move: PlayerId
+    prev_pending_capture_from: Optional[int]
 
 
 class GameRules:
@@ -27,6 +41,24 @@ class GameRules:
         self.board.reset()
         self.turn = TurnState()
 
+    def branch(self) -> "GameRules":
+        # Independent copy without a deepcopy walk
+        clone = GameRules.__new__(GameRules)
+        clone.board = self.board.copy()
+        clone.turn = TurnState(self.turn.to_move, self.turn.pending_capture_from)
+        return clone
+
+    def snapshot(self) -> Snapshot:
+        red, green = self.board.masks()
+        return red, green, self.board.zhash(), self.turn.to_move, self.turn.pending_capture_from
+
+    def restore(self, snapshot: Snapshot) -> None:
+        # Rewind in place to a state taken by snapshot()
+        red, green, zhash, to_move, pending = snapshot
+        self.board.load_masks(red, green, zhash)
+        self.turn.to_move = to_move
+        self.turn.pending_capture_from = pending
+
     def apply_player_move(self, player: PlayerId, origin: int, target: int) -> MoveResult:
         # Enforce turn order and capture chains
         if player != self.turn.to_move:
@@ -53,6 +85,77 @@ class GameRules:
 
         return result
 
+    def generate_moves(self, player: Optional[PlayerId] = None) -> List[MoveOption]:
+        # Moves for the search, straight from the board masks: a pending chain
+        # pins the origin, and any capture on the board makes captures mandatory
+        if player is None:
+            player = self.turn.to_move
+        board = self.board
+
+        if player == self.turn.to_move and self.turn.pending_capture_from is not None:
+            origin = self.turn.pending_capture_from
+            if board.occupant(origin) != player:
+                return []
+            return board.capture_moves(origin, player)
+
+        captures: List[MoveOption] = []
+        quiets: List[MoveOption] = []
+        for origin in board.pieces(player):
+            capture_moves = board.capture_moves(origin, player)
+            if capture_moves:
+                captures.extend(capture_moves)
+            elif not captures:
+                quiets.extend(board.simple_moves(origin, player))
+
+        if captures:
+            return captures
+        return quiets
+
+    def push(self, player: PlayerId, origin: int, target: int) -> Optional[MoveUndo]:
+        # Apply a move in place and record how to take it back
+        prev_to_move = self.turn.to_move
+        prev_pending = self.turn.pending_capture_from
+        result = self.apply_player_move(player, origin, target)
+        if not result.legal:
+            return None
+        return MoveUndo(
+            player=player,
+            origin=origin,
+            target=target,
+            captured=result.captured,
+            prev_to_move=prev_to_move,
+            prev_pending_capture_from=prev_pending,
+        )
+
+    def make_move(self, option: MoveOption) -> MoveUndo:
+        # Unchecked push for a move produced by the move generator for the side to move;
+        # skips the legality re-check and MoveResult of apply_player_move
+        player = self.turn.to_move
+        undo = MoveUndo(
+            player=player,
+            origin=option.origin,
+            target=option.target,
+            captured=option.captured,
+            prev_to_move=player,
+            prev_pending_capture_from=self.turn.pending_capture_from,
+        )
+        board = self.board
+        board.move_piece(player, option.origin, option.target, option.captured)
+
+        # Same chain rule as apply_player_move: keep jumping unless the capture won
+        if option.captured is not None and board.remaining(3 - player):
+            if board.capture_moves(option.target, player):
+                self.turn.pending_capture_from = option.target
+                return undo
+        self.turn.swap_turn()
+        return undo
+
+    def pop(self, undo: MoveUndo) -> None:
+        # Revert a move made by push or make_move
+        self.board.unmove_piece(undo.player, undo.origin, undo.target, undo.captured)
+        self.turn.to_move = undo.prev_to_move
+        self.turn.pending_capture_from = undo.prev_pending_capture_from
+
     def remaining(self, player: PlayerId) -> int:
         # Expose piece counts for UI/AI
         return self.board.remaining(player)